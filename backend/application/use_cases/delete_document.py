@@ -1,16 +1,26 @@
 """Use case: Suppression d'un document."""
 
+import asyncio
+import logging
+from backend.domain.exceptions import DocumentNotFoundError
 from backend.domain.models.document import Document
 from backend.domain.ports.document_repository_port import DocumentRepositoryPort
 from backend.domain.ports.file_storage_port import FileStoragePort
+from backend.domain.ports.job_queue_port import JobQueuePort
 from src.domain.ports.vector_store_port import VectorStorePort
 
+logger = logging.getLogger(__name__)
+
 
 class DeleteDocumentUseCase:
     """
     Supprime un document du storage, de la base de donnees et du vector store.
 
     La validation d'existence est deleguee a Document.get_or_fail().
+    La ligne en base est supprimee d'abord: si cette suppression echoue, rien
+    d'autre n'a ete touche et le client peut reessayer. Le fichier et les
+    vecteurs sont ensuite supprimes en parallele; si la suppression des vecteurs
+    echoue, un job de purge est enqueue au lieu de faire echouer la requete.
     """
 
     def __init__(
@@ -18,10 +28,12 @@ class DeleteDocumentUseCase:
         storage: FileStoragePort,
         repo: DocumentRepositoryPort,
         vector_store: VectorStorePort,
+        job_queue: JobQueuePort,
     ):
         self._storage = storage
         self._repo = repo
         self._vector_store = vector_store
+        self._job_queue = job_queue
 
     async def execute(self, document_id: str, company_id: str) -> None:
         document = Document.get_or_fail(
@@ -29,12 +41,28 @@ class DeleteDocumentUseCase:
             document_id,
         )
 
-        # Supprimer les vecteurs du vector store
-        await self._vector_store.delete_by_document_id(document_id)
+        if not await self._repo.delete(document_id, company_id):
+            raise DocumentNotFoundError(document_id)
+
+        # Vecteurs et fichier GCS en parallele
+        vectors_result, storage_result = await asyncio.gather(
+            self._vector_store.delete_by_document_id(document_id),
+            self._storage.delete(document.gcs_path) if document.gcs_path else asyncio.sleep(0),
+            return_exceptions=True,
+        )
 
-        # Supprimer le fichier de GCS
-        if document.gcs_path:
-            await self._storage.delete(document.gcs_path)
+        # Compensation: purge des vecteurs reportee au worker
+        if isinstance(vectors_result, BaseException):
+            logger.warning(
+                f"Vector deletion failed for {document_id}, scheduling purge: {vectors_result}"
+            )
+            await self._job_queue.enqueue(
+                "purge_document_vectors", document_id=document_id
+            )
 
-        # Supprimer les métadonnées de la DB
-        await self._repo.delete(document_id, company_id)
+        # Le document n'existe plus pour le client: un fichier orphelin est
+        # journalise, pas remonte (une nouvelle tentative repondrait 404)
+        if isinstance(storage_result, BaseException):
+            logger.error(
+                f"Storage deletion failed for {document_id} ({document.gcs_path}): {storage_result}"
+            )
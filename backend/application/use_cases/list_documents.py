@@ -1,14 +1,32 @@
 """Use case: Liste des documents d'une entreprise."""
 
+import asyncio
+from typing import Optional
+
 from backend.domain.models.document import Document
 from backend.domain.ports.document_repository_port import DocumentRepositoryPort
 
 
 class ListDocumentsUseCase:
-    """Liste tous les documents d'une entreprise."""
+    """Liste les documents d'une entreprise (pagination optionnelle)."""
 
     def __init__(self, repo: DocumentRepositoryPort):
         self._repo = repo
 
-    async def execute(self, company_id: str) -> list[Document]:
-        return await self._repo.list_by_company(company_id)
+    async def execute(
+        self, company_id: str, limit: Optional[int] = None, offset: int = 0
+    ) -> tuple[list[Document], int]:
+        """
+        Returns:
+            (documents de la page, nombre total de documents de l'entreprise)
+        """
+        if limit is None and offset == 0:
+            # Liste complete: le total est sa longueur, pas de requete COUNT
+            documents = await self._repo.list_by_company(company_id)
+            return documents, len(documents)
+
+        documents, total = await asyncio.gather(
+            self._repo.list_by_company(company_id, limit, offset),
+            self._repo.count_by_company(company_id),
+        )
+        return documents, total
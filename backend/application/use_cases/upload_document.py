@@ -1,13 +1,13 @@
 """Use case: Upload d'un document PDF (validation, GCS, enqueue vectorisation)."""
 
+import asyncio
 import logging
+from typing import BinaryIO
 
-from backend.domain.exceptions import PageLimitExceededError
-from backend.domain.models.document import Document
+from backend.domain.models.document import Document, DocumentStatus
 from backend.domain.ports.document_repository_port import DocumentRepositoryPort
 from backend.domain.ports.file_storage_port import FileStoragePort
 from backend.domain.ports.job_queue_port import JobQueuePort
-from backend.domain.ports.pdf_analyzer_port import PdfAnalyzerPort
 from src.config import settings
 
 logger = logging.getLogger(__name__)
@@ -15,8 +15,14 @@ logger = logging.getLogger(__name__)
 
 class UploadDocumentUseCase:
     """
-    Recoit un fichier PDF, valide, compte les pages, verifie le quota,
-    upload vers GCS, persiste les metadonnees, et enqueue la vectorisation.
+    Recoit un fichier PDF, valide type et taille, upload vers GCS,
+    persiste les metadonnees, et enqueue la vectorisation.
+
+    Le PDF n'est pas parse ici: le comptage des pages et le quota sont
+    verifies par le worker, qui publie un evenement 'failed' en cas de depassement.
+
+    Le fichier est recu sous forme de file object (fichier temporaire spoole
+    par Starlette) et n'est jamais charge entierement en memoire.
 
     Le worker ne recoit que {document_id, company_id, gcs_path} via Redis.
     """
@@ -26,52 +32,58 @@ class UploadDocumentUseCase:
         repo: DocumentRepositoryPort,
         job_queue: JobQueuePort,
         storage: FileStoragePort,
-        pdf_analyzer: PdfAnalyzerPort,
     ):
         self._repo = repo
         self._job_queue = job_queue
         self._storage = storage
-        self._pdf_analyzer = pdf_analyzer
 
     async def execute(
         self,
         company_id: str,
         filename: str,
-        content: bytes,
+        file: BinaryIO,
+        size_bytes: int,
         content_type: str,
     ) -> Document:
         # 1. Creer le Document (validation type + taille)
         document = Document.create(
             company_id=company_id,
             filename=filename,
-            size_bytes=len(content),
+            size_bytes=size_bytes,
             content_type=content_type,
             max_upload_size_bytes=settings.MAX_UPLOAD_SIZE_BYTES,
         )
 
-        # 2. Compter les pages du PDF
-        num_pages = self._pdf_analyzer.count_pages(content)
-        document.num_pages = num_pages
-
-        # 3. Verifier le quota de pages
-        current_total = await self._repo.get_total_pages(company_id)
-        max_pages = settings.MAX_PAGES_PER_COMPANY
-        if current_total + num_pages > max_pages:
-            raise PageLimitExceededError(current_total, num_pages, max_pages)
-
-        # 4. Upload vers GCS
-        gcs_path = await self._storage.upload(
-            company_id=company_id,
-            document_id=document.document_id,
-            file_content=content,
-            content_type=content_type,
+        # 2. Upload GCS et insertion de la ligne (status=uploading) en parallele
+        document.status = DocumentStatus.UPLOADING
+        upload_result, create_result = await asyncio.gather(
+            self._storage.upload(
+                company_id=company_id,
+                document_id=document.document_id,
+                file_obj=file,
+                size_bytes=size_bytes,
+                content_type=content_type,
+            ),
+            self._repo.create(document),
+            return_exceptions=True,
         )
-        document.gcs_path = gcs_path
+        if isinstance(create_result, BaseException):
+            if not isinstance(upload_result, BaseException):
+                await self._storage.delete(upload_result)
+            raise create_result
+        if isinstance(upload_result, BaseException):
+            await self._repo.update_status(
+                document.document_id, DocumentStatus.FAILED, str(upload_result)
+            )
+            raise upload_result
 
-        # 5. Persister les metadonnees completes (status=queued, gcs_path + num_pages set)
-        await self._repo.create(document)
+        gcs_path = upload_result
+        document.assign_storage_path(gcs_path)
+        document.status = DocumentStatus.QUEUED
 
-        # 6. Enqueue le job pour le worker via ARQ
+        # 3. Completer les metadonnees, puis enqueue le job ARQ une fois la
+        #    mise a jour commitee (le worker recoit gcs_path dans les arguments du job)
+        await self._repo.update_after_upload(document.document_id, gcs_path)
         await self._job_queue.enqueue(
             "process_document",
             document_id=document.document_id,
@@ -81,6 +93,6 @@ class UploadDocumentUseCase:
 
         logger.info(
             f"Document {document.document_id} uploaded and queued for vectorization "
-            f"(company={company_id}, file={filename}, pages={num_pages})"
+            f"(company={company_id}, file={filename})"
         )
         return document
@@ -1,4 +1,4 @@
-"""Exceptions domain pour la gestion des documents."""
+"""Exceptions domain pour la gestion des documents et des utilisateurs."""
 
 
 class DocumentNotFoundError(Exception):
@@ -39,3 +39,11 @@ class PageLimitExceededError(Exception):
             f"Limite de pages depassee: {current_pages} existantes + {new_pages} nouvelles "
             f"= {current_pages + new_pages} pages (max: {max_pages})"
         )
+
+
+class EmailAlreadyRegisteredError(Exception):
+    """L'email est deja utilise par un autre utilisateur."""
+
+    def __init__(self, email: str):
+        self.email = email
+        super().__init__(f"Email deja enregistre: {email}")
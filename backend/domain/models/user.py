@@ -1,14 +1,40 @@
 """Modele domain et schemas API pour la gestion des utilisateurs."""
 
+import os
+import time
 import uuid
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional
 
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr
 
 
-@dataclass
+def _uuid7() -> uuid.UUID:
+    """
+    UUID version 7 (RFC 9562): 48 bits de timestamp ms + 74 bits aleatoires.
+
+    Les IDs sont ordonnes dans le temps: les insertions dans l'index de
+    cle primaire users se font en fin d'arbre (moins de page splits).
+    Remplace par uuid.uuid7() natif quand disponible (Python 3.14+).
+    """
+    value = int.from_bytes(os.urandom(10), "big")  # 80 bits, 74 utilises
+    rand_a = value >> 68  # 12 bits
+    rand_b = value & ((1 << 62) - 1)  # 62 bits
+    unix_ts_ms = time.time_ns() // 1_000_000
+    return uuid.UUID(
+        int=(unix_ts_ms & ((1 << 48) - 1)) << 80
+        | 0x7 << 76
+        | rand_a << 64
+        | 0b10 << 62
+        | rand_b
+    )
+
+
+_new_user_id = getattr(uuid, "uuid7", _uuid7)
+
+
+@dataclass(slots=True, frozen=True)
 class User:
     """
     Entite utilisateur du domaine.
@@ -33,9 +59,9 @@ class User:
         company_id: str,
         full_name: Optional[str] = None,
     ) -> "User":
-        """Factory method: cree un nouvel utilisateur avec un UUID."""
+        """Factory method: cree un nouvel utilisateur avec un UUIDv7."""
         return cls(
-            user_id=str(uuid.uuid4()),
+            user_id=str(_new_user_id()),
             email=email,
             hashed_password=hashed_password,
             company_id=company_id,
@@ -50,6 +76,8 @@ class User:
 class Token(BaseModel):
     """Schema de reponse pour le token JWT."""
 
+    model_config = ConfigDict(frozen=True, populate_by_name=True)
+
     access_token: str
     token_type: str
 
@@ -57,8 +85,14 @@ class Token(BaseModel):
 class TokenData(BaseModel):
     """Donnees extraites du token JWT."""
 
+    model_config = ConfigDict(frozen=True, populate_by_name=True)
+
     email: Optional[str] = None
     company_id: Optional[str] = None
+    # Claims utilisateur (absents des anciens tokens et des tokens widget)
+    user_id: Optional[str] = None
+    full_name: Optional[str] = None
+    disabled: Optional[bool] = None
 
 
 class UserCreate(BaseModel):
@@ -73,17 +107,21 @@ class UserCreate(BaseModel):
 class UserResponse(BaseModel):
     """Schema de reponse pour un utilisateur (sans mot de passe)."""
 
+    model_config = ConfigDict(frozen=True, populate_by_name=True)
+
     user_id: str
     email: str
     company_id: str
     full_name: Optional[str] = None
     disabled: bool
-    created_at: Optional[str] = None
+    created_at: Optional[datetime] = None
 
 
 class UserInDB(BaseModel):
     """Schema interne pour un utilisateur avec mot de passe hashe."""
 
+    model_config = ConfigDict(frozen=True, populate_by_name=True)
+
     user_id: str
     email: str
     hashed_password: str
@@ -15,6 +15,11 @@ class CompanyRepositoryPort(ABC):
     - InMemoryCompanyRepository (pour tests)
     """
 
+    @abstractmethod
+    async def create_many(self, companies: list[Company]) -> None:
+        """Sauvegarde un lot d'entreprises en une seule operation (import en masse)."""
+        ...
+
     @abstractmethod
     async def get_by_api_key(self, api_key: str) -> Optional[Company]:
         """Recupere une entreprise par son API key."""
@@ -17,7 +17,16 @@ class DocumentRepositoryPort(ABC):
 
     @abstractmethod
     async def create(self, document: Document) -> None:
-        """Sauvegarde les metadonnees d'un document."""
+        """
+        Sauvegarde les metadonnees d'un document.
+
+        Renseigne document.uploaded_at (genere par la base) dans le meme aller-retour.
+        """
+        ...
+
+    @abstractmethod
+    async def create_many(self, documents: list[Document]) -> None:
+        """Sauvegarde un lot de documents en une seule operation (import en masse)."""
         ...
 
     @abstractmethod
@@ -28,8 +37,20 @@ class DocumentRepositoryPort(ABC):
         ...
 
     @abstractmethod
-    async def list_by_company(self, company_id: str) -> list[Document]:
-        """Liste tous les documents d'une entreprise."""
+    async def list_by_company(
+        self, company_id: str, limit: Optional[int] = None, offset: int = 0
+    ) -> list[Document]:
+        """
+        Liste les documents d'une entreprise (plus recents d'abord).
+
+        Pagination optionnelle: sans limit, tous les documents sont retournes.
+        La date est renseignee dans uploaded_at_ms (epoch ms), pas dans uploaded_at.
+        """
+        ...
+
+    @abstractmethod
+    async def count_by_company(self, company_id: str) -> int:
+        """Nombre total de documents d'une entreprise."""
         ...
 
     @abstractmethod
@@ -42,6 +63,25 @@ class DocumentRepositoryPort(ABC):
         """Retourne le nombre total de pages PDF pour une entreprise."""
         ...
 
+    @abstractmethod
+    async def record_page_count(
+        self, document_id: str, company_id: str, num_pages: int, max_pages: int
+    ) -> bool:
+        """
+        Enregistre num_pages et l'ajoute au total de l'entreprise, si le quota le permet.
+
+        Verification et reservation sont atomiques (pas de course entre jobs concurrents).
+        Idempotent: seul l'ecart avec le num_pages deja enregistre est facture
+        (job rejoue apres un redemarrage du worker).
+
+        Returns:
+            True si enregistre, False si le quota max_pages serait depasse
+
+        Raises:
+            DocumentNotFoundError: le document a ete supprime entre-temps
+        """
+        ...
+
     @abstractmethod
     async def update_status(
         self, document_id: str, status: str, error_message: str | None = None
@@ -50,8 +90,20 @@ class DocumentRepositoryPort(ABC):
         ...
 
     @abstractmethod
-    async def update_after_upload(
-        self, document_id: str, gcs_path: str, num_pages: int
-    ) -> None:
-        """Met a jour gcs_path et num_pages apres upload GCS."""
+    async def mark_completed(self, document_id: str, chunk_count: int) -> None:
+        """
+        Passe le document en 'completed' avec son nombre de chunks et sa date
+        de fin de traitement, en une seule ecriture.
+        """
+        ...
+
+    @abstractmethod
+    async def update_after_upload(self, document_id: str, gcs_path: str) -> None:
+        """
+        Met a jour gcs_path apres upload GCS.
+
+        Passe le document de 'uploading' a 'queued' (sans ecraser un statut
+        deja avance par le worker). num_pages et le quota de pages sont geres
+        par le worker (record_page_count).
+        """
         ...
@@ -29,8 +29,18 @@ class EventBrokerPort(ABC):
         ...
 
     @abstractmethod
-    async def publish(self, channel: str, message: str) -> None:
-        """Publie un message sur un canal."""
+    async def publish(self, channel: str, message: str | bytes) -> None:
+        """Publie un message (texte ou JSON deja encode en bytes) sur un canal."""
+        ...
+
+    @abstractmethod
+    async def publish_many(self, messages: list[tuple[str, str | bytes]]) -> None:
+        """
+        Publie plusieurs messages en un seul aller-retour.
+
+        Args:
+            messages: Liste de (channel, message)
+        """
         ...
 
     @abstractmethod
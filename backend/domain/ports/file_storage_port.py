@@ -1,6 +1,7 @@
 """Port abstrait pour le stockage de fichiers (GCS, S3, local, etc.)."""
 
 from abc import ABC, abstractmethod
+from typing import BinaryIO
 
 
 class FileStoragePort(ABC):
@@ -17,16 +18,18 @@ class FileStoragePort(ABC):
         self,
         company_id: str,
         document_id: str,
-        file_content: bytes,
+        file_obj: BinaryIO,
+        size_bytes: int,
         content_type: str = "application/pdf",
     ) -> str:
         """
-        Upload un fichier vers le storage.
+        Upload un fichier vers le storage en streaming.
 
         Args:
             company_id: ID entreprise (prefix du path)
             document_id: ID unique du document
-            file_content: Contenu binaire du fichier
+            file_obj: Fichier binaire (lu depuis le debut, jamais charge en memoire)
+            size_bytes: Taille du fichier en octets
             content_type: Type MIME
 
         Returns:
@@ -47,6 +50,17 @@ class FileStoragePort(ABC):
         """
         ...
 
+    @abstractmethod
+    async def download_to(self, gcs_path: str, file_path: str) -> None:
+        """
+        Telecharge un fichier du storage directement sur disque (streaming).
+
+        Args:
+            gcs_path: Chemin du fichier dans le storage
+            file_path: Chemin local de destination
+        """
+        ...
+
     @abstractmethod
     async def delete(self, gcs_path: str) -> bool:
         """
@@ -12,6 +12,11 @@ class JobQueuePort(ABC):
     - InMemoryJobQueueAdapter (pour tests)
     """
 
+    @abstractmethod
+    async def startup(self) -> None:
+        """Ouvre la connexion (appele une fois au demarrage)."""
+        ...
+
     @abstractmethod
     async def enqueue(self, job_name: str, **kwargs) -> None:
         """
@@ -23,6 +28,16 @@ class JobQueuePort(ABC):
         """
         ...
 
+    @abstractmethod
+    async def enqueue_many(self, jobs: list[tuple[str, dict]]) -> None:
+        """
+        Enqueue plusieurs jobs en un seul lot.
+
+        Args:
+            jobs: Liste de (job_name, kwargs)
+        """
+        ...
+
     @abstractmethod
     async def close(self) -> None:
         """Ferme la connexion."""
@@ -1,6 +1,7 @@
 """Port abstrait pour l'analyse de fichiers PDF."""
 
 from abc import ABC, abstractmethod
+from typing import BinaryIO
 
 
 class PdfAnalyzerPort(ABC):
@@ -12,12 +13,12 @@ class PdfAnalyzerPort(ABC):
     """
 
     @abstractmethod
-    def count_pages(self, content: bytes) -> int:
+    def count_pages(self, file_obj: BinaryIO) -> int:
         """
         Compte le nombre de pages d'un PDF.
 
         Args:
-            content: Contenu binaire du fichier PDF
+            file_obj: Fichier PDF binaire (seekable)
 
         Returns:
             Nombre de pages
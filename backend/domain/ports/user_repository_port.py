@@ -17,7 +17,17 @@ class UserRepositoryPort(ABC):
 
     @abstractmethod
     async def create(self, user: User) -> None:
-        """Sauvegarde un nouvel utilisateur."""
+        """
+        Sauvegarde un nouvel utilisateur.
+
+        Raises:
+            EmailAlreadyRegisteredError: si l'email est deja utilise.
+        """
+        ...
+
+    @abstractmethod
+    async def create_many(self, users: list[User]) -> None:
+        """Sauvegarde un lot d'utilisateurs en une seule operation (import en masse)."""
         ...
 
     @abstractmethod
@@ -25,6 +35,15 @@ class UserRepositoryPort(ABC):
         """Recupere un utilisateur par son email."""
         ...
 
+    async def get_by_email_fresh(self, email: str) -> Optional[User]:
+        """
+        Recupere un utilisateur par son email sans passer par un cache.
+
+        Reserve aux decisions d'authentification (mot de passe, disabled):
+        un changement en base est pris en compte immediatement.
+        """
+        return await self.get_by_email(email)
+
     @abstractmethod
     async def get_by_id(self, user_id: str) -> Optional[User]:
         """Recupere un utilisateur par son ID."""
@@ -34,3 +53,8 @@ class UserRepositoryPort(ABC):
     async def email_exists(self, email: str) -> bool:
         """Verifie si un email est deja utilise."""
         ...
+
+    @abstractmethod
+    async def update_password_hash(self, user_id: str, hashed_password: str) -> None:
+        """Remplace le hash du mot de passe (rehash au cout bcrypt courant)."""
+        ...
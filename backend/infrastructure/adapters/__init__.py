@@ -1,4 +1,5 @@
 """Adapters d'infrastructure du backend."""
-from backend.infrastructure.adapters.broadcast_adapter import BroadcastEventBroker
+from backend.infrastructure.adapters.redis_event_broker import RedisEventBroker
+from backend.infrastructure.adapters.batching_event_publisher import BatchingEventPublisher
 
-__all__ = ["BroadcastEventBroker"]
+__all__ = ["RedisEventBroker", "BatchingEventPublisher"]
@@ -1,5 +1,6 @@
 """Adapter ARQ pour la file d'attente de jobs."""
 
+import asyncio
 import logging
 from typing import Optional
 from urllib.parse import urlparse
@@ -11,7 +12,7 @@ from backend.domain.ports.job_queue_port import JobQueuePort
 logger = logging.getLogger(__name__)
 
 
-def parse_redis_settings(url: str) -> RedisSettings:
+def parse_redis_settings(url: str, max_connections: Optional[int] = None) -> RedisSettings:
     """Parse une URL Redis en RedisSettings ARQ."""
     parsed = urlparse(url)
     return RedisSettings(
@@ -19,6 +20,7 @@ def parse_redis_settings(url: str) -> RedisSettings:
         port=parsed.port or 6379,
         password=parsed.password,
         database=int(parsed.path.lstrip("/") or "0"),
+        max_connections=max_connections,
     )
 
 
@@ -26,24 +28,46 @@ class ArqJobQueueAdapter(JobQueuePort):
     """
     Implementation du JobQueuePort utilisant ARQ (async Redis queue).
 
-    Le pool Redis est cree paresseusement au premier appel enqueue().
+    Le pool Redis est cree au demarrage via startup() (lifespan FastAPI).
+    A defaut, il est cree paresseusement au premier enqueue(), protege
+    par un verrou pour ne jamais creer deux pools en parallele.
     ARQ gere la serialisation, le retry et le suivi des jobs.
     """
 
     def __init__(self, redis_settings: RedisSettings):
         self._settings = redis_settings
         self._pool: Optional[ArqRedis] = None
+        self._lock = asyncio.Lock()
+
+    async def startup(self) -> None:
+        await self._get_pool()
 
     async def _get_pool(self) -> ArqRedis:
         if self._pool is None:
-            self._pool = await create_pool(self._settings)
+            async with self._lock:
+                if self._pool is None:
+                    self._pool = await create_pool(self._settings)
         return self._pool
 
     async def enqueue(self, job_name: str, **kwargs) -> None:
-        pool = await self._get_pool()
+        pool = self._pool or await self._get_pool()
         job = await pool.enqueue_job(job_name, **kwargs)
         logger.info(f"Job enqueued: {job_name} (job_id={job.job_id})")
 
+    async def enqueue_many(self, jobs: list[tuple[str, dict]]) -> None:
+        """
+        Enqueue un lot de jobs en parallele sur le pool Redis.
+
+        ARQ execute chaque enqueue_job dans sa propre transaction
+        WATCH/MULTI (deduplication par job_id): les jobs ne peuvent pas
+        partager un pipeline, mais les aller-retours se recouvrent.
+        """
+        pool = self._pool or await self._get_pool()
+        enqueued = await asyncio.gather(
+            *(pool.enqueue_job(job_name, **kwargs) for job_name, kwargs in jobs)
+        )
+        logger.info(f"{len(enqueued)} jobs enqueued")
+
     async def close(self) -> None:
         if self._pool:
             await self._pool.aclose()
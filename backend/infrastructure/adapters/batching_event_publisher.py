@@ -0,0 +1,60 @@
+"""Decorateur du broker qui regroupe les publications concurrentes."""
+import asyncio
+
+from backend.domain.ports.event_broker_port import EventBrokerPort
+
+
+class BatchingEventPublisher(EventBrokerPort):
+    """
+    Regroupe les publish() emis pendant un meme tour de boucle d'evenements.
+
+    Chaque publish() met le message en attente et attend son flush. Le flush,
+    planifie au premier message du tour, envoie tout le lot via
+    inner.publish_many(): N requetes concurrentes coutent un seul aller-retour
+    Redis au lieu de N. connect/disconnect/subscribe sont delegues tels quels.
+    """
+
+    def __init__(self, inner: EventBrokerPort):
+        self._inner = inner
+        self._pending: list[tuple[str, str | bytes, asyncio.Future]] = []
+        self._flush_task: asyncio.Task | None = None
+
+    async def connect(self) -> None:
+        await self._inner.connect()
+
+    async def disconnect(self) -> None:
+        if self._flush_task is not None:
+            await self._flush_task
+        await self._inner.disconnect()
+
+    async def publish(self, channel: str, message: str | bytes) -> None:
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((channel, message, future))
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush())
+        await future
+
+    async def publish_many(self, messages: list[tuple[str, str | bytes]]) -> None:
+        await self._inner.publish_many(messages)
+
+    def subscribe(self, channel: str):
+        return self._inner.subscribe(channel)
+
+    async def _flush(self) -> None:
+        # Laisse les autres coroutines du tour courant ajouter leurs messages
+        await asyncio.sleep(0)
+        batch, self._pending = self._pending, []
+        self._flush_task = None
+
+        try:
+            await self._inner.publish_many(
+                [(channel, message) for channel, message, _ in batch]
+            )
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_result(None)
@@ -0,0 +1,42 @@
+"""Filtre de Bloom en memoire des emails utilisateurs enregistres."""
+
+import hashlib
+import math
+
+
+class UserEmailBloom:
+    """
+    Filtre de Bloom des emails deja enregistres (par processus).
+
+    Repond "absent" (certain) ou "peut-etre present" (a verifier en base).
+    Tant que le filtre n'est pas hydrate (ready=False), il ne doit pas
+    etre utilise pour conclure a l'absence d'un email.
+
+    Au-dela de `capacity` elements le taux de faux positifs augmente,
+    sans jamais produire de faux negatif.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        self._num_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self._num_hashes = max(1, round(self._num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self._num_bits + 7) // 8)
+        self.ready = False
+
+    def _positions(self, email: str):
+        digest = hashlib.blake2b(email.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self._num_hashes):
+            yield (h1 + i * h2) % self._num_bits
+
+    def add(self, email: str) -> None:
+        for pos in self._positions(email):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def might_contain(self, email: str) -> bool:
+        return all(
+            self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(email)
+        )
+
+    def mark_ready(self) -> None:
+        self.ready = True
@@ -3,9 +3,15 @@
 import asyncio
 import json
 import logging
+import shutil
+import tempfile
+from typing import BinaryIO
+
 from google.cloud import storage
+from google.cloud.storage import transfer_manager
 from google.oauth2 import service_account
 
+from src.config import settings
 from backend.domain.ports.file_storage_port import FileStoragePort
 
 logger = logging.getLogger(__name__)
@@ -22,6 +28,11 @@ class GCSFileStorageAdapter(FileStoragePort):
     1. service_account_key (JSON string depuis .env)
     2. GOOGLE_APPLICATION_CREDENTIALS (variable d'environnement standard)
     3. Default credentials (GCE, Cloud Run, etc.)
+
+    Les fichiers sont lus en streaming depuis un file object (jamais en bytes).
+    Les fichiers au-dela de GCS_PARALLEL_UPLOAD_THRESHOLD_BYTES sont envoyes
+    en parties de GCS_UPLOAD_CHUNK_SIZE_BYTES uploadees en parallele
+    (transfer_manager, XML multipart API).
     """
 
     def __init__(
@@ -46,25 +57,58 @@ class GCSFileStorageAdapter(FileStoragePort):
         self,
         company_id: str,
         document_id: str,
-        file_content: bytes,
+        file_obj: BinaryIO,
+        size_bytes: int,
         content_type: str = "application/pdf",
     ) -> str:
         gcs_path = f"{company_id}/{document_id}.pdf"
         blob = self._bucket.blob(gcs_path)
 
-        await asyncio.to_thread(
-            blob.upload_from_string, file_content, content_type=content_type
-        )
+        if size_bytes > settings.GCS_PARALLEL_UPLOAD_THRESHOLD_BYTES:
+            await asyncio.to_thread(
+                self._upload_chunks_concurrently, blob, file_obj, content_type
+            )
+        else:
+            await asyncio.to_thread(
+                blob.upload_from_file,
+                file_obj,
+                rewind=True,
+                size=size_bytes,
+                content_type=content_type,
+            )
 
         logger.info(f"Uploaded {gcs_path} to gs://{self._bucket_name}")
         return gcs_path
 
+    @staticmethod
+    def _upload_chunks_concurrently(
+        blob: storage.Blob, file_obj: BinaryIO, content_type: str
+    ) -> None:
+        """Upload multipart parallele (bloquant, execute dans un thread)."""
+        with tempfile.NamedTemporaryFile(suffix=".pdf") as tmp:
+            file_obj.seek(0)
+            shutil.copyfileobj(file_obj, tmp)
+            tmp.flush()
+            transfer_manager.upload_chunks_concurrently(
+                tmp.name,
+                blob,
+                content_type=content_type,
+                chunk_size=settings.GCS_UPLOAD_CHUNK_SIZE_BYTES,
+                max_workers=settings.GCS_UPLOAD_WORKERS,
+                worker_type=transfer_manager.THREAD,
+            )
+
     async def download(self, gcs_path: str) -> bytes:
         blob = self._bucket.blob(gcs_path)
         content = await asyncio.to_thread(blob.download_as_bytes)
         logger.info(f"Downloaded {gcs_path} from gs://{self._bucket_name}")
         return content
 
+    async def download_to(self, gcs_path: str, file_path: str) -> None:
+        blob = self._bucket.blob(gcs_path)
+        await asyncio.to_thread(blob.download_to_filename, file_path)
+        logger.info(f"Downloaded {gcs_path} from gs://{self._bucket_name} to {file_path}")
+
     async def delete(self, gcs_path: str) -> bool:
         blob = self._bucket.blob(gcs_path)
 
@@ -1,6 +1,6 @@
 """Adapter pypdf pour l'analyse de fichiers PDF."""
 
-import io
+from typing import BinaryIO
 
 from pypdf import PdfReader
 
@@ -10,6 +10,7 @@ from backend.domain.ports.pdf_analyzer_port import PdfAnalyzerPort
 class PypdfAnalyzerAdapter(PdfAnalyzerPort):
     """Implementation de PdfAnalyzerPort utilisant pypdf."""
 
-    def count_pages(self, content: bytes) -> int:
-        reader = PdfReader(io.BytesIO(content))
+    def count_pages(self, file_obj: BinaryIO) -> int:
+        file_obj.seek(0)
+        reader = PdfReader(file_obj)
         return len(reader.pages)
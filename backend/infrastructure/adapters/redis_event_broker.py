@@ -0,0 +1,98 @@
+"""Adapter Redis pour le broker d'evenements (redis.asyncio natif)."""
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
+import redis.asyncio as redis
+
+from backend.domain.ports.event_broker_port import EventBrokerPort
+
+logger = logging.getLogger(__name__)
+
+
+class RedisEventBroker(EventBrokerPort):
+    """
+    Implementation du EventBrokerPort utilisant redis.asyncio directement.
+
+    - Publications sur un pool de connexions partage (parser hiredis si installe).
+    - Une seule connexion PubSub pour tout le processus: une tache de lecture
+      distribue chaque message aux queues des abonnes locaux du canal.
+      Le SUBSCRIBE Redis n'est envoye qu'au premier abonne d'un canal,
+      l'UNSUBSCRIBE au depart du dernier.
+    """
+
+    def __init__(self, url: str, max_connections: int = 64):
+        self._pool = redis.ConnectionPool.from_url(
+            url, max_connections=max_connections, decode_responses=True
+        )
+        self._redis = redis.Redis(connection_pool=self._pool)
+        self._pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+        self._listeners: dict[str, set[asyncio.Queue]] = {}
+        self._reader: asyncio.Task | None = None
+
+    async def connect(self) -> None:
+        await self._redis.ping()
+
+    async def disconnect(self) -> None:
+        if self._reader is not None:
+            self._reader.cancel()
+            try:
+                await self._reader
+            except asyncio.CancelledError:
+                pass
+            self._reader = None
+        await self._pubsub.aclose()
+        await self._redis.aclose()
+        await self._pool.aclose()
+
+    async def publish(self, channel: str, message: str | bytes) -> None:
+        await self._redis.publish(channel, message)
+
+    async def publish_many(self, messages: list[tuple[str, str | bytes]]) -> None:
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for channel, message in messages:
+                pipe.publish(channel, message)
+            await pipe.execute()
+
+    @asynccontextmanager
+    async def subscribe(self, channel: str):
+        queue: asyncio.Queue = asyncio.Queue()
+        listeners = self._listeners.setdefault(channel, set())
+        listeners.add(queue)
+        try:
+            if len(listeners) == 1:
+                await self._pubsub.subscribe(channel)
+            if self._reader is None:
+                self._reader = asyncio.create_task(self._read())
+            yield _QueueSubscription(queue)
+        finally:
+            listeners.discard(queue)
+            if not listeners:
+                del self._listeners[channel]
+                await self._pubsub.unsubscribe(channel)
+
+    async def _read(self) -> None:
+        """Distribue les messages de la connexion PubSub aux abonnes locaux."""
+        while True:
+            try:
+                message = await self._pubsub.get_message(timeout=1.0)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Redis pub/sub read failed: {e}")
+                await asyncio.sleep(1.0)
+                continue
+            if message is None:
+                continue
+            for queue in self._listeners.get(message["channel"], ()):
+                queue.put_nowait(message["data"])
+
+
+class _QueueSubscription:
+    """Abonnement local: expose get() -> str sur la queue alimentee par le lecteur."""
+
+    def __init__(self, queue: asyncio.Queue):
+        self._queue = queue
+
+    async def get(self) -> str:
+        return await self._queue.get()
@@ -10,14 +10,21 @@ Documentation: https://python-dependency-injector.ets-labs.org/
 from dependency_injector import containers, providers
 
 from src.config import settings
-from backend.infrastructure.adapters.broadcast_adapter import BroadcastEventBroker
+from backend.application.use_cases.upload_document import UploadDocumentUseCase
+from backend.application.use_cases.list_documents import ListDocumentsUseCase
+from backend.application.use_cases.delete_document import DeleteDocumentUseCase
+from backend.infrastructure.adapters.redis_event_broker import RedisEventBroker
+from backend.infrastructure.adapters.batching_event_publisher import BatchingEventPublisher
 from backend.infrastructure.adapters.gcs_storage_adapter import GCSFileStorageAdapter
-from backend.infrastructure.adapters.pypdf_analyzer_adapter import PypdfAnalyzerAdapter
 from backend.infrastructure.adapters.arq_job_queue_adapter import ArqJobQueueAdapter
 from backend.infrastructure.adapters.arq_job_queue_adapter import parse_redis_settings
+from backend.infrastructure.adapters.email_bloom_filter import UserEmailBloom
+from backend.infrastructure.db.pool import create_pool
 from backend.infrastructure.repositories.document_repository import PostgresDocumentRepository
 from backend.infrastructure.repositories.user_repository import PostgresUserRepository
 from backend.infrastructure.repositories.company_repository import PostgresCompanyRepository
+from backend.infrastructure.repositories.cached_user_repository import CachedUserRepository
+from backend.infrastructure.repositories.cached_company_repository import CachedCompanyRepository
 from src.infrastructure.adapters.pgvector_adapter import PGVectorAdapter
 
 
@@ -44,17 +51,32 @@ class Container(containers.DeclarativeContainer):
         ]
     )
 
+    # =========================================================================
+    # DATABASE
+    # =========================================================================
+
+    db_pool = providers.Singleton(create_pool)
+    """
+    Pool de connexions PostgreSQL (Singleton).
+    Ouvert/ferme dans le lifespan FastAPI, partage par tous les repositories.
+    """
+
     # =========================================================================
     # EVENT BROKER
     # =========================================================================
 
     event_broker = providers.Singleton(
-        BroadcastEventBroker,
-        url=settings.REDIS_URL,
+        BatchingEventPublisher,
+        inner=providers.Singleton(
+            RedisEventBroker,
+            url=settings.REDIS_URL,
+            max_connections=settings.REDIS_POOL_SIZE,
+        ),
     )
     """
     Broker d'evenements (Singleton).
     Une seule connexion Redis partagee par toute l'application.
+    Les publish() concurrents d'un meme tour de boucle partent en un pipeline.
     """
 
     # =========================================================================
@@ -63,9 +85,14 @@ class Container(containers.DeclarativeContainer):
 
     job_queue = providers.Singleton(
         ArqJobQueueAdapter,
-        redis_settings=parse_redis_settings(settings.REDIS_URL),
+        redis_settings=parse_redis_settings(
+            settings.REDIS_URL, max_connections=settings.ARQ_POOL_SIZE
+        ),
     )
-    """File d'attente ARQ pour les jobs de traitement de documents."""
+    """
+    File d'attente ARQ pour les jobs de traitement de documents.
+    Pool Redis ouvert dans le lifespan FastAPI (startup()).
+    """
 
     # =========================================================================
     # DOCUMENT MANAGEMENT
@@ -81,29 +108,71 @@ class Container(containers.DeclarativeContainer):
 
     document_repository = providers.Singleton(
         PostgresDocumentRepository,
+        pool=db_pool,
     )
     """Repository metadonnees documents (Singleton)."""
 
-    pdf_analyzer = providers.Singleton(
-        PypdfAnalyzerAdapter,
-    )
-    """Analyseur PDF pour le comptage de pages (Singleton)."""
-    
     vector_store = providers.Singleton(
         PGVectorAdapter,
     )
     """Vector store pour les embeddings (Singleton)."""
 
+    # =========================================================================
+    # USE CASES (sans etat: construits une fois, partages par les requetes)
+    # =========================================================================
+
+    upload_document_uc = providers.Singleton(
+        UploadDocumentUseCase,
+        repo=document_repository,
+        job_queue=job_queue,
+        storage=file_storage,
+    )
+    """Use case d'upload de document (Singleton)."""
+
+    list_documents_uc = providers.Singleton(
+        ListDocumentsUseCase,
+        repo=document_repository,
+    )
+    """Use case de listing des documents (Singleton)."""
+
+    delete_document_uc = providers.Singleton(
+        DeleteDocumentUseCase,
+        storage=file_storage,
+        repo=document_repository,
+        vector_store=vector_store,
+        job_queue=job_queue,
+    )
+    """Use case de suppression de document (Singleton)."""
+
     # =========================================================================
     # USER MANAGEMENT
     # =========================================================================
 
-    user_repository = providers.Singleton(
+    email_bloom = providers.Singleton(
+        UserEmailBloom,
+        capacity=settings.USER_EMAIL_BLOOM_CAPACITY,
+    )
+    """Filtre de Bloom des emails enregistres (hydrate dans le lifespan)."""
+
+    postgres_user_repository = providers.Singleton(
         PostgresUserRepository,
+        pool=db_pool,
+        email_bloom=email_bloom,
+    )
+    """Repository utilisateurs PostgreSQL (sans cache)."""
+
+    user_repository = providers.Singleton(
+        CachedUserRepository,
+        inner=postgres_user_repository,
+        ttl=settings.REPO_CACHE_TTL_SECONDS,
+        maxsize=settings.REPO_CACHE_MAXSIZE,
     )
-    """Repository utilisateurs (Singleton)."""
+    """Repository utilisateurs (Singleton), cache TTL devant PostgreSQL."""
 
     company_repository = providers.Singleton(
-        PostgresCompanyRepository,
+        CachedCompanyRepository,
+        inner=providers.Singleton(PostgresCompanyRepository, pool=db_pool),
+        ttl=settings.REPO_CACHE_TTL_SECONDS,
+        maxsize=settings.REPO_CACHE_MAXSIZE,
     )
-    """Repository entreprises (Singleton)."""
+    """Repository entreprises (Singleton), cache TTL devant PostgreSQL."""
@@ -0,0 +1,4 @@
+"""Acces base de donnees partage du backend (pool de connexions)."""
+from backend.infrastructure.db.pool import create_pool
+
+__all__ = ["create_pool"]
@@ -0,0 +1,39 @@
+"""
+Pool de connexions PostgreSQL partage par les repositories du backend.
+
+Evite d'ouvrir une connexion TCP + TLS + auth a chaque requete SQL:
+les repositories empruntent une connexion au pool et la rendent
+a la fin du bloc `async with`.
+
+Les requetes des repositories sont des chaines constantes: avec
+prepare_threshold=0, psycopg les prepare cote serveur des la premiere
+execution et les reutilise (cache par connexion, cle = texte SQL).
+"""
+
+from psycopg.rows import tuple_row
+from psycopg_pool import AsyncConnectionPool
+
+from src.config import settings
+
+
+def create_pool() -> AsyncConnectionPool:
+    """
+    Cree le pool de connexions (non ouvert).
+
+    Le pool est ouvert dans le lifespan FastAPI (ou au startup du worker)
+    via `await pool.open()` et ferme a l'arret via `await pool.close()`.
+    """
+    return AsyncConnectionPool(
+        conninfo=settings.get_postgres_uri(),
+        min_size=settings.DB_POOL_MIN,
+        max_size=settings.DB_POOL_MAX,
+        open=False,
+        kwargs={
+            "row_factory": tuple_row,
+            "prepare_threshold": (
+                int(settings.DB_PREPARE_THRESHOLD)
+                if settings.DB_PREPARE_THRESHOLD
+                else None
+            ),
+        },
+    )
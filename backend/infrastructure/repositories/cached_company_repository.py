@@ -0,0 +1,70 @@
+"""Cache read-through en memoire devant le repository des entreprises."""
+
+import hashlib
+import logging
+from typing import Optional
+
+from cachetools import TTLCache
+
+from backend.domain.models.company import Company
+from backend.domain.ports.company_repository_port import CompanyRepositoryPort
+
+logger = logging.getLogger(__name__)
+
+
+class CachedCompanyRepository(CompanyRepositoryPort):
+    """
+    Decorateur de CompanyRepositoryPort avec cache TTL en memoire.
+
+    get_by_api_key est appele a chaque demande de token widget: un hit
+    evite l'aller-retour PostgreSQL. Les API keys ne sont jamais gardees
+    en clair comme cle de cache (sha256).
+
+    Seuls les resultats trouves sont mis en cache, pour qu'une entreprise
+    nouvellement creee soit visible immediatement.
+    """
+
+    def __init__(self, inner: CompanyRepositoryPort, ttl: int, maxsize: int):
+        self._inner = inner
+        self._by_api_key: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._by_id: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    @staticmethod
+    def _api_key_hash(api_key: str) -> str:
+        return hashlib.sha256(api_key.encode()).hexdigest()
+
+    async def create_many(self, companies: list[Company]) -> None:
+        await self._inner.create_many(companies)
+
+    async def get_by_api_key(self, api_key: str) -> Optional[Company]:
+        key = self._api_key_hash(api_key)
+        company = self._by_api_key.get(key)
+        if company is not None:
+            return company
+
+        company = await self._inner.get_by_api_key(api_key)
+        if company is not None:
+            self._by_api_key[key] = company
+            self._by_id[company.company_id] = company
+        return company
+
+    async def get_by_id(self, company_id: str) -> Optional[Company]:
+        company = self._by_id.get(company_id)
+        if company is not None:
+            return company
+
+        company = await self._inner.get_by_id(company_id)
+        if company is not None:
+            self._by_id[company_id] = company
+        return company
+
+    def invalidate(self, company_id: str) -> None:
+        """Retire une entreprise du cache (a appeler apres modification)."""
+        self._by_id.pop(company_id, None)
+        stale = [
+            key for key, company in self._by_api_key.items()
+            if company.company_id == company_id
+        ]
+        for key in stale:
+            self._by_api_key.pop(key, None)
+        logger.debug(f"Company cache invalidated for {company_id}")
@@ -0,0 +1,79 @@
+"""Cache read-through en memoire devant le repository des utilisateurs."""
+
+import logging
+from typing import Optional
+
+from cachetools import TTLCache
+
+from backend.domain.models.user import User
+from backend.domain.ports.user_repository_port import UserRepositoryPort
+
+logger = logging.getLogger(__name__)
+
+
+class CachedUserRepository(UserRepositoryPort):
+    """
+    Decorateur de UserRepositoryPort avec cache TTL en memoire.
+
+    get_by_email est appele a chaque requete authentifiee (resolution du
+    current user): un hit evite l'aller-retour PostgreSQL.
+
+    Seuls les utilisateurs trouves sont mis en cache; create() et
+    update_password_hash() invalident l'entree correspondante.
+
+    Le login (mot de passe, disabled) ne lit jamais le cache: il passe par
+    get_by_email_fresh, qui relit la base et rafraichit l'entree. Un
+    utilisateur desactive ou un mot de passe change (y compris par un autre
+    processus) est donc pris en compte sans attendre l'expiration du TTL.
+    """
+
+    def __init__(self, inner: UserRepositoryPort, ttl: int, maxsize: int):
+        self._inner = inner
+        self._by_email: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    async def create(self, user: User) -> None:
+        await self._inner.create(user)
+        self.invalidate(user.email)
+
+    async def create_many(self, users: list[User]) -> None:
+        await self._inner.create_many(users)
+        for user in users:
+            self.invalidate(user.email)
+
+    async def get_by_email(self, email: str) -> Optional[User]:
+        user = self._by_email.get(email)
+        if user is not None:
+            return user
+
+        user = await self._inner.get_by_email(email)
+        if user is not None:
+            self._by_email[email] = user
+        return user
+
+    async def get_by_email_fresh(self, email: str) -> Optional[User]:
+        user = await self._inner.get_by_email(email)
+        if user is None:
+            self.invalidate(email)
+        else:
+            self._by_email[email] = user
+        return user
+
+    async def get_by_id(self, user_id: str) -> Optional[User]:
+        return await self._inner.get_by_id(user_id)
+
+    async def email_exists(self, email: str) -> bool:
+        if email in self._by_email:
+            return True
+        return await self._inner.email_exists(email)
+
+    async def update_password_hash(self, user_id: str, hashed_password: str) -> None:
+        await self._inner.update_password_hash(user_id, hashed_password)
+        # Cache indexe par email: rare (rehash), un parcours suffit
+        for email, user in list(self._by_email.items()):
+            if user.user_id == user_id:
+                self.invalidate(email)
+
+    def invalidate(self, email: str) -> None:
+        """Retire un utilisateur du cache (a appeler apres modification)."""
+        self._by_email.pop(email, None)
+        logger.debug(f"User cache invalidated for {email}")
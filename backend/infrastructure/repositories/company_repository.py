@@ -3,9 +3,9 @@
 import logging
 from typing import Optional
 
-import psycopg
+from psycopg.rows import class_row
+from psycopg_pool import AsyncConnectionPool
 
-from src.config import settings
 from backend.domain.models.company import Company
 from backend.domain.ports.company_repository_port import CompanyRepositoryPort
 
@@ -16,13 +16,38 @@ class PostgresCompanyRepository(CompanyRepositoryPort):
     """
     Acces aux entreprises dans PostgreSQL.
     Utilise psycopg3 async, meme pattern que UserRepository.
+    Les connexions sont empruntees au pool partage (voir backend.infrastructure.db).
     """
 
-    async def get_by_api_key(self, api_key: str) -> Optional[Company]:
-        async with await psycopg.AsyncConnection.connect(
-            settings.get_postgres_uri()
-        ) as conn:
+    def __init__(self, pool: AsyncConnectionPool):
+        self._pool = pool
+
+    async def create_many(self, companies: list[Company]) -> None:
+        if not companies:
+            return
+
+        async with self._pool.connection() as conn:
             async with conn.cursor() as cur:
+                async with cur.copy(
+                    "COPY companies (company_id, name, api_key, tone, plan) FROM STDIN"
+                ) as copy:
+                    for company in companies:
+                        await copy.write_row(
+                            (
+                                company.company_id,
+                                company.name,
+                                company.api_key,
+                                company.tone,
+                                company.plan,
+                            )
+                        )
+            await conn.commit()
+
+        logger.info(f"{len(companies)} companies created (bulk)")
+
+    async def get_by_api_key(self, api_key: str) -> Optional[Company]:
+        async with self._pool.connection() as conn:
+            async with conn.cursor(row_factory=class_row(Company)) as cur:
                 await cur.execute(
                     """
                     SELECT company_id, name, api_key, tone, plan, created_at
@@ -31,23 +56,11 @@ class PostgresCompanyRepository(CompanyRepositoryPort):
                     """,
                     (api_key,),
                 )
-                row = await cur.fetchone()
-                if row:
-                    return Company(
-                        company_id=row[0],
-                        name=row[1],
-                        api_key=row[2],
-                        tone=row[3],
-                        plan=row[4],
-                        created_at=row[5],
-                    )
-                return None
+                return await cur.fetchone()
 
     async def get_by_id(self, company_id: str) -> Optional[Company]:
-        async with await psycopg.AsyncConnection.connect(
-            settings.get_postgres_uri()
-        ) as conn:
-            async with conn.cursor() as cur:
+        async with self._pool.connection() as conn:
+            async with conn.cursor(row_factory=class_row(Company)) as cur:
                 await cur.execute(
                     """
                     SELECT company_id, name, api_key, tone, plan, created_at
@@ -56,15 +69,4 @@ class PostgresCompanyRepository(CompanyRepositoryPort):
                     """,
                     (company_id,),
                 )
-                row = await cur.fetchone()
-
-                if row:
-                    return Company(
-                        company_id=row[0],
-                        name=row[1],
-                        api_key=row[2],
-                        tone=row[3],
-                        plan=row[4],
-                        created_at=row[5],
-                    )
-                return None
+                return await cur.fetchone()
@@ -3,10 +3,11 @@
 import logging
 from typing import Optional
 
-import psycopg
+from psycopg.rows import class_row
+from psycopg_pool import AsyncConnectionPool
 
-from src.config import settings
-from backend.domain.models.document import Document
+from backend.domain.exceptions import DocumentNotFoundError
+from backend.domain.models.document import Document, DocumentStatus
 from backend.domain.ports.document_repository_port import DocumentRepositoryPort
 
 logger = logging.getLogger(__name__)
@@ -16,12 +17,14 @@ class PostgresDocumentRepository(DocumentRepositoryPort):
     """
     Acces aux metadonnees de documents dans PostgreSQL.
     Utilise psycopg3 async, meme pattern que CompanyRepository.
+    Les connexions sont empruntees au pool partage (voir backend.infrastructure.db).
     """
 
+    def __init__(self, pool: AsyncConnectionPool):
+        self._pool = pool
+
     async def create(self, document: Document) -> None:
-        async with await psycopg.AsyncConnection.connect(
-            settings.get_postgres_uri()
-        ) as conn:
+        async with self._pool.connection() as conn:
             async with conn.cursor() as cur:
                 await cur.execute(
                     """
@@ -30,6 +33,7 @@ class PostgresDocumentRepository(DocumentRepositoryPort):
                         gcs_path, size_bytes, num_pages,
                         content_type, status, error_message
                     ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+                    RETURNING uploaded_at
                     """,
                     (
                         document.document_id,
@@ -43,6 +47,15 @@ class PostgresDocumentRepository(DocumentRepositoryPort):
                         document.error_message,
                     ),
                 )
+                (document.uploaded_at,) = await cur.fetchone()
+                if document.num_pages:
+                    await cur.execute(
+                        """
+                        UPDATE companies SET total_pages = total_pages + %s
+                        WHERE company_id = %s
+                        """,
+                        (document.num_pages, document.company_id),
+                    )
             await conn.commit()
 
         logger.info(
@@ -50,13 +63,61 @@ class PostgresDocumentRepository(DocumentRepositoryPort):
             f"saved for company {document.company_id}"
         )
 
+    async def create_many(self, documents: list[Document]) -> None:
+        if not documents:
+            return
+
+        pages_by_company: dict[str, int] = {}
+        for document in documents:
+            pages_by_company[document.company_id] = (
+                pages_by_company.get(document.company_id, 0) + document.num_pages
+            )
+
+        async with self._pool.connection() as conn:
+            async with conn.cursor() as cur:
+                async with cur.copy(
+                    """
+                    COPY documents (
+                        document_id, company_id, filename,
+                        gcs_path, size_bytes, num_pages,
+                        content_type, status, error_message
+                    ) FROM STDIN
+                    """
+                ) as copy:
+                    for document in documents:
+                        await copy.write_row(
+                            (
+                                document.document_id,
+                                document.company_id,
+                                document.filename,
+                                document.gcs_path,
+                                document.size_bytes,
+                                document.num_pages,
+                                document.content_type,
+                                document.status,
+                                document.error_message,
+                            )
+                        )
+                await cur.executemany(
+                    """
+                    UPDATE companies SET total_pages = total_pages + %s
+                    WHERE company_id = %s
+                    """,
+                    [
+                        (pages, company_id)
+                        for company_id, pages in pages_by_company.items()
+                        if pages
+                    ],
+                )
+            await conn.commit()
+
+        logger.info(f"{len(documents)} documents saved (bulk)")
+
     async def get_by_id(
         self, document_id: str, company_id: str
     ) -> Optional[Document]:
-        async with await psycopg.AsyncConnection.connect(
-            settings.get_postgres_uri()
-        ) as conn:
-            async with conn.cursor() as cur:
+        async with self._pool.connection() as conn:
+            async with conn.cursor(row_factory=class_row(Document)) as cur:
                 await cur.execute(
                     """
                     SELECT document_id, company_id, filename,
@@ -67,79 +128,105 @@ class PostgresDocumentRepository(DocumentRepositoryPort):
                     """,
                     (document_id, company_id),
                 )
-                row = await cur.fetchone()
-
-                if row:
-                    return Document(
-                        document_id=row[0],
-                        company_id=row[1],
-                        filename=row[2],
-                        gcs_path=row[3],
-                        size_bytes=row[4],
-                        num_pages=row[5],
-                        content_type=row[6],
-                        status=row[7],
-                        error_message=row[8],
-                        uploaded_at=row[9],
-                    )
-                return None
+                return await cur.fetchone()
 
-    async def list_by_company(self, company_id: str) -> list[Document]:
-        async with await psycopg.AsyncConnection.connect(
-            settings.get_postgres_uri()
-        ) as conn:
-            async with conn.cursor() as cur:
+    async def list_by_company(
+        self, company_id: str, limit: Optional[int] = None, offset: int = 0
+    ) -> list[Document]:
+        async with self._pool.connection() as conn:
+            async with conn.cursor(row_factory=class_row(Document)) as cur:
                 await cur.execute(
                     """
                     SELECT document_id, company_id, filename,
                            gcs_path, size_bytes, num_pages,
-                           content_type, status, error_message, uploaded_at
+                           content_type, status, error_message,
+                           (EXTRACT(EPOCH FROM uploaded_at) * 1000)::bigint
+                               AS uploaded_at_ms
                     FROM documents
                     WHERE company_id = %s
                     ORDER BY uploaded_at DESC
+                    LIMIT %s OFFSET %s
                     """,
+                    (company_id, limit, offset),  # LIMIT NULL: pas de limite
+                )
+                return await cur.fetchall()
+
+    async def count_by_company(self, company_id: str) -> int:
+        async with self._pool.connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    "SELECT COUNT(*) FROM documents WHERE company_id = %s",
                     (company_id,),
                 )
-                rows = await cur.fetchall()
-
-                return [
-                    Document(
-                        document_id=r[0],
-                        company_id=r[1],
-                        filename=r[2],
-                        gcs_path=r[3],
-                        size_bytes=r[4],
-                        num_pages=r[5],
-                        content_type=r[6],
-                        status=r[7],
-                        error_message=r[8],
-                        uploaded_at=r[9],
-                    )
-                    for r in rows
-                ]
+                row = await cur.fetchone()
+                return row[0]
 
     async def get_total_pages(self, company_id: str) -> int:
-        async with await psycopg.AsyncConnection.connect(
-            settings.get_postgres_uri()
-        ) as conn:
+        async with self._pool.connection() as conn:
             async with conn.cursor() as cur:
                 await cur.execute(
-                    "SELECT COALESCE(SUM(num_pages), 0) FROM documents WHERE company_id = %s",
+                    "SELECT total_pages FROM companies WHERE company_id = %s",
                     (company_id,),
                 )
                 row = await cur.fetchone()
                 return row[0] if row else 0
 
+    async def record_page_count(
+        self, document_id: str, company_id: str, num_pages: int, max_pages: int
+    ) -> bool:
+        async with self._pool.connection() as conn:
+            async with conn.cursor() as cur:
+                # Verrou sur le document: un job rejoue par ARQ ne facture que
+                # l'ecart avec les pages deja enregistrees (idempotent)
+                await cur.execute(
+                    "SELECT num_pages FROM documents WHERE document_id = %s FOR UPDATE",
+                    (document_id,),
+                )
+                row = await cur.fetchone()
+                if row is None:
+                    # Supprime pendant le traitement: rien a facturer (rollback du pool)
+                    raise DocumentNotFoundError(document_id)
+
+                delta = num_pages - (row[0] or 0)
+                if delta:
+                    await cur.execute(
+                        """
+                        UPDATE companies SET total_pages = GREATEST(total_pages + %s, 0)
+                        WHERE company_id = %s AND (%s < 0 OR total_pages + %s <= %s)
+                        RETURNING company_id
+                        """,
+                        (delta, company_id, delta, delta, max_pages),
+                    )
+                    if await cur.fetchone() is None:
+                        await conn.rollback()
+                        return False
+                    await cur.execute(
+                        "UPDATE documents SET num_pages = %s WHERE document_id = %s",
+                        (num_pages, document_id),
+                    )
+            await conn.commit()
+        return True
+
     async def delete(self, document_id: str, company_id: str) -> bool:
-        async with await psycopg.AsyncConnection.connect(
-            settings.get_postgres_uri()
-        ) as conn:
+        async with self._pool.connection() as conn:
             async with conn.cursor() as cur:
                 await cur.execute(
-                    "DELETE FROM documents WHERE document_id = %s AND company_id = %s",
+                    """
+                    DELETE FROM documents WHERE document_id = %s AND company_id = %s
+                    RETURNING num_pages
+                    """,
                     (document_id, company_id),
                 )
-                deleted = cur.rowcount > 0
+                row = await cur.fetchone()
+                deleted = row is not None
+                if row and row[0]:
+                    await cur.execute(
+                        """
+                        UPDATE companies SET total_pages = GREATEST(total_pages - %s, 0)
+                        WHERE company_id = %s
+                        """,
+                        (row[0], company_id),
+                    )
             await conn.commit()
 
         if deleted:
@@ -149,9 +236,7 @@ class PostgresDocumentRepository(DocumentRepositoryPort):
     async def update_status(
         self, document_id: str, status: str, error_message: str | None = None
     ) -> None:
-        async with await psycopg.AsyncConnection.connect(
-            settings.get_postgres_uri()
-        ) as conn:
+        async with self._pool.connection() as conn:
             async with conn.cursor() as cur:
                 await cur.execute(
                     """
@@ -164,20 +249,39 @@ class PostgresDocumentRepository(DocumentRepositoryPort):
 
         logger.debug(f"Document {document_id} status -> {status}")
 
-    async def update_after_upload(
-        self, document_id: str, gcs_path: str, num_pages: int
-    ) -> None:
-        async with await psycopg.AsyncConnection.connect(
-            settings.get_postgres_uri()
-        ) as conn:
+    async def mark_completed(self, document_id: str, chunk_count: int) -> None:
+        async with self._pool.connection() as conn:
             async with conn.cursor() as cur:
                 await cur.execute(
                     """
-                    UPDATE documents SET gcs_path = %s, num_pages = %s
+                    UPDATE documents
+                    SET status = %s, error_message = NULL,
+                        chunk_count = %s, completed_at = CURRENT_TIMESTAMP
                     WHERE document_id = %s
                     """,
-                    (gcs_path, num_pages, document_id),
+                    (DocumentStatus.COMPLETED, chunk_count, document_id),
+                )
+            await conn.commit()
+
+        logger.debug(f"Document {document_id} status -> {DocumentStatus.COMPLETED} ({chunk_count} chunks)")
+
+    async def update_after_upload(self, document_id: str, gcs_path: str) -> None:
+        async with self._pool.connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    """
+                    UPDATE documents
+                    SET gcs_path = %s,
+                        status = CASE WHEN status = %s THEN %s ELSE status END
+                    WHERE document_id = %s
+                    """,
+                    (
+                        gcs_path,
+                        DocumentStatus.UPLOADING,
+                        DocumentStatus.QUEUED,
+                        document_id,
+                    ),
                 )
             await conn.commit()
 
-        logger.info(f"Document {document_id} uploaded to {gcs_path} ({num_pages} pages)")
+        logger.info(f"Document {document_id} uploaded to {gcs_path}")
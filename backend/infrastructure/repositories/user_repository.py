@@ -3,11 +3,14 @@
 import logging
 from typing import Optional
 
-import psycopg
+from psycopg import errors
+from psycopg.rows import class_row
+from psycopg_pool import AsyncConnectionPool
 
-from src.config import settings
+from backend.domain.exceptions import EmailAlreadyRegisteredError
 from backend.domain.models.user import User
 from backend.domain.ports.user_repository_port import UserRepositoryPort
+from backend.infrastructure.adapters.email_bloom_filter import UserEmailBloom
 
 logger = logging.getLogger(__name__)
 
@@ -16,38 +19,96 @@ class PostgresUserRepository(UserRepositoryPort):
     """
     Acces aux utilisateurs dans PostgreSQL.
     Utilise psycopg3 async, meme pattern que DocumentRepository.
+    Les connexions sont empruntees au pool partage (voir backend.infrastructure.db).
+
+    Si un filtre de Bloom est fourni (et hydrate), email_exists repond
+    sans requete SQL pour les emails certainement absents.
     """
 
+    def __init__(
+        self, pool: AsyncConnectionPool, email_bloom: Optional[UserEmailBloom] = None
+    ):
+        self._pool = pool
+        self._email_bloom = email_bloom
+
+    async def hydrate_email_bloom(self) -> None:
+        """Charge tous les emails existants dans le filtre de Bloom (au demarrage)."""
+        if self._email_bloom is None:
+            return
+
+        count = 0
+        async with self._pool.connection() as conn:
+            async with conn.cursor() as cur:
+                async for (email,) in cur.stream("SELECT email FROM users"):
+                    self._email_bloom.add(email)
+                    count += 1
+        self._email_bloom.mark_ready()
+        logger.info(f"Email bloom filter hydrated with {count} emails")
+
     async def create(self, user: User) -> None:
-        async with await psycopg.AsyncConnection.connect(
-            settings.get_postgres_uri()
-        ) as conn:
+        try:
+            async with self._pool.connection() as conn:
+                async with conn.cursor() as cur:
+                    await cur.execute(
+                        """
+                        INSERT INTO users (
+                            user_id, email, hashed_password,
+                            company_id, full_name, disabled
+                        ) VALUES (%s, %s, %s, %s, %s, %s)
+                        """,
+                        (
+                            user.user_id,
+                            user.email,
+                            user.hashed_password,
+                            user.company_id,
+                            user.full_name,
+                            user.disabled,
+                        ),
+                    )
+                await conn.commit()
+        except errors.UniqueViolation as e:
+            # Possible si un autre processus a enregistre l'email entre-temps
+            raise EmailAlreadyRegisteredError(user.email) from e
+
+        if self._email_bloom is not None:
+            self._email_bloom.add(user.email)
+        logger.info(f"User '{user.email}' ({user.user_id}) created for company {user.company_id}")
+
+    async def create_many(self, users: list[User]) -> None:
+        if not users:
+            return
+
+        async with self._pool.connection() as conn:
             async with conn.cursor() as cur:
-                await cur.execute(
+                async with cur.copy(
                     """
-                    INSERT INTO users (
+                    COPY users (
                         user_id, email, hashed_password,
                         company_id, full_name, disabled
-                    ) VALUES (%s, %s, %s, %s, %s, %s)
-                    """,
-                    (
-                        user.user_id,
-                        user.email,
-                        user.hashed_password,
-                        user.company_id,
-                        user.full_name,
-                        user.disabled,
-                    ),
-                )
+                    ) FROM STDIN
+                    """
+                ) as copy:
+                    for user in users:
+                        await copy.write_row(
+                            (
+                                user.user_id,
+                                user.email,
+                                user.hashed_password,
+                                user.company_id,
+                                user.full_name,
+                                user.disabled,
+                            )
+                        )
             await conn.commit()
 
-        logger.info(f"User '{user.email}' ({user.user_id}) created for company {user.company_id}")
+        if self._email_bloom is not None:
+            for user in users:
+                self._email_bloom.add(user.email)
+        logger.info(f"{len(users)} users created (bulk)")
 
     async def get_by_email(self, email: str) -> Optional[User]:
-        async with await psycopg.AsyncConnection.connect(
-            settings.get_postgres_uri()
-        ) as conn:
-            async with conn.cursor() as cur:
+        async with self._pool.connection() as conn:
+            async with conn.cursor(row_factory=class_row(User)) as cur:
                 await cur.execute(
                     """
                     SELECT user_id, email, hashed_password,
@@ -57,25 +118,11 @@ class PostgresUserRepository(UserRepositoryPort):
                     """,
                     (email,),
                 )
-                row = await cur.fetchone()
-
-                if row:
-                    return User(
-                        user_id=row[0],
-                        email=row[1],
-                        hashed_password=row[2],
-                        company_id=row[3],
-                        full_name=row[4],
-                        disabled=row[5],
-                        created_at=row[6],
-                    )
-                return None
+                return await cur.fetchone()
 
     async def get_by_id(self, user_id: str) -> Optional[User]:
-        async with await psycopg.AsyncConnection.connect(
-            settings.get_postgres_uri()
-        ) as conn:
-            async with conn.cursor() as cur:
+        async with self._pool.connection() as conn:
+            async with conn.cursor(row_factory=class_row(User)) as cur:
                 await cur.execute(
                     """
                     SELECT user_id, email, hashed_password,
@@ -85,24 +132,14 @@ class PostgresUserRepository(UserRepositoryPort):
                     """,
                     (user_id,),
                 )
-                row = await cur.fetchone()
-
-                if row:
-                    return User(
-                        user_id=row[0],
-                        email=row[1],
-                        hashed_password=row[2],
-                        company_id=row[3],
-                        full_name=row[4],
-                        disabled=row[5],
-                        created_at=row[6],
-                    )
-                return None
+                return await cur.fetchone()
 
     async def email_exists(self, email: str) -> bool:
-        async with await psycopg.AsyncConnection.connect(
-            settings.get_postgres_uri()
-        ) as conn:
+        bloom = self._email_bloom
+        if bloom is not None and bloom.ready and not bloom.might_contain(email):
+            return False
+
+        async with self._pool.connection() as conn:
             async with conn.cursor() as cur:
                 await cur.execute(
                     "SELECT 1 FROM users WHERE email = %s LIMIT 1",
@@ -110,3 +147,13 @@ class PostgresUserRepository(UserRepositoryPort):
                 )
                 row = await cur.fetchone()
                 return row is not None
+
+    async def update_password_hash(self, user_id: str, hashed_password: str) -> None:
+        async with self._pool.connection() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(
+                    "UPDATE users SET hashed_password = %s WHERE user_id = %s",
+                    (hashed_password, user_id),
+                )
+            await conn.commit()
+        logger.info(f"Password hash updated for user {user_id}")
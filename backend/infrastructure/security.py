@@ -6,34 +6,142 @@ selon les recommandations FastAPI:
 https://fastapi.tiangolo.com/tutorial/security/oauth2-jwt/
 """
 
+import asyncio
+import base64
+import hmac
+import logging
+import math
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from typing import Annotated, Optional
 
+import bcrypt
 import jwt
+import orjson
+from cachetools import TTLCache
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jwt.exceptions import InvalidTokenError
-from passlib.context import CryptContext
 
 from src.config import settings
 from backend.domain.models.user import TokenData, User
 from backend.domain.ports.user_repository_port import UserRepositoryPort
 
-# Configuration du hachage de mots de passe (bcrypt)
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+logger = logging.getLogger(__name__)
+
+# bcrypt n'utilise que les 72 premiers octets du mot de passe
+_BCRYPT_MAX_PASSWORD_BYTES = 72
+_BCRYPT_MIN_ROUNDS = 10
+_BCRYPT_MAX_ROUNDS = 16
+
+# Cout bcrypt des nouveaux hash (ajustable au demarrage par calibrate_bcrypt_rounds)
+_bcrypt_rounds = settings.BCRYPT_ROUNDS
+
+# bcrypt coute ~100 ms de CPU par appel: execute hors de la boucle d'evenements,
+# dans un pool borne au nombre de coeurs (l'extension C relache le GIL)
+_BCRYPT_POOL = ThreadPoolExecutor(
+    max_workers=os.cpu_count(), thread_name_prefix="bcrypt"
+)
+
+# References fortes vers les taches de fond (rehash) jusqu'a leur fin
+_background_tasks: set[asyncio.Task] = set()
 
 # Schema OAuth2 - le tokenUrl pointe vers l'endpoint de login
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/token")
 
+def _b64url(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+# En-tete JWT constant: encode une seule fois au chargement du module
+_JWT_HEADER_B64 = _b64url(orjson.dumps({"alg": settings.JWT_ALGORITHM, "typ": "JWT"}))
+_JWT_KEY = settings.JWT_SECRET_KEY.encode("utf-8")
+
+# Tokens deja verifies: token brut -> (TokenData, exp). Evite de refaire
+# la verification HMAC a chaque requete d'un meme client.
+_token_cache: TTLCache = TTLCache(
+    maxsize=settings.TOKEN_CACHE_MAXSIZE,
+    ttl=settings.TOKEN_CACHE_TTL_SECONDS,
+)
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verifie si un mot de passe correspond au hash."""
-    return pwd_context.verify(plain_password, hashed_password)
 
+def _encode_password(password: str) -> bytes:
+    return password.encode("utf-8")[:_BCRYPT_MAX_PASSWORD_BYTES]
+
+
+def _parse_bcrypt_cost(hashed_password: str) -> Optional[int]:
+    """Cout d'un hash bcrypt ($2b$12$...), ou None si le hash est mal forme."""
+    parts = hashed_password.split("$", 3)
+    if len(parts) != 4 or parts[0] or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+def _check_password(plain_password: str, hashed_password: str) -> bool:
+    try:
+        return bcrypt.checkpw(
+            _encode_password(plain_password), hashed_password.encode("utf-8")
+        )
+    except ValueError:
+        # Hash mal forme
+        return False
 
-def get_password_hash(password: str) -> str:
-    """Hash un mot de passe avec bcrypt."""
-    return pwd_context.hash(password)
+
+def _hash_password(password: str) -> str:
+    salt = bcrypt.gensalt(rounds=_bcrypt_rounds)
+    return bcrypt.hashpw(_encode_password(password), salt).decode("utf-8")
+
+
+def _check_dummy_password(plain_password: str) -> bool:
+    return _check_password(plain_password, _dummy_hash(_bcrypt_rounds))
+
+
+async def _run_bcrypt(func, *args):
+    return await asyncio.get_running_loop().run_in_executor(_BCRYPT_POOL, func, *args)
+
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verifie si un mot de passe correspond au hash (dans le pool bcrypt)."""
+    if _parse_bcrypt_cost(hashed_password) is None:
+        # Hash mal forme: inutile de lancer le KDF
+        return False
+    return await _run_bcrypt(_check_password, plain_password, hashed_password)
+
+
+async def get_password_hash(password: str) -> str:
+    """Hash un mot de passe avec bcrypt (dans le pool bcrypt)."""
+    return await _run_bcrypt(_hash_password, password)
+
+
+@lru_cache(maxsize=None)
+def _dummy_hash(rounds: int) -> str:
+    """Hash de reference pour egaliser le temps de reponse sur email inconnu."""
+    return bcrypt.hashpw(b"dummy", bcrypt.gensalt(rounds=rounds)).decode("utf-8")
+
+
+def calibrate_bcrypt_rounds(max_ms: float) -> int:
+    """
+    Choisit le cout bcrypt le plus eleve dont le hash reste sous max_ms.
+
+    Mesure un hash au cout minimal puis extrapole (chaque +1 double le temps).
+    Bloquant: a appeler une fois au demarrage, hors de la boucle d'evenements.
+    """
+    global _bcrypt_rounds
+
+    start = time.perf_counter()
+    bcrypt.hashpw(b"calibration", bcrypt.gensalt(rounds=_BCRYPT_MIN_ROUNDS))
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    extra = int(math.log2(max_ms / elapsed_ms)) if elapsed_ms < max_ms else 0
+    _bcrypt_rounds = min(_BCRYPT_MIN_ROUNDS + extra, _BCRYPT_MAX_ROUNDS)
+    logger.info(
+        f"bcrypt calibrated: rounds={_bcrypt_rounds} "
+        f"(cost {_BCRYPT_MIN_ROUNDS} = {elapsed_ms:.1f} ms, budget {max_ms} ms)"
+    )
+    return _bcrypt_rounds
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -52,7 +160,9 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
         expire = datetime.now(timezone.utc) + expires_delta
     else:
         expire = datetime.now(timezone.utc) + timedelta(minutes=15)
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": int(expire.timestamp())})
+    if settings.JWT_ALGORITHM == "HS256":
+        return _encode_hs256(to_encode)
     encoded_jwt = jwt.encode(
         to_encode,
         settings.JWT_SECRET_KEY,
@@ -61,6 +171,14 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
+def _encode_hs256(claims: dict) -> str:
+    """Signe un JWT HS256 avec l'en-tete pre-encode (seul le payload est serialise)."""
+    signing_input = _JWT_HEADER_B64 + b"." + _b64url(orjson.dumps(claims))
+    # hmac.digest + nom de digest: chemin one-shot OpenSSL (SHA-NI si disponible)
+    signature = hmac.digest(_JWT_KEY, signing_input, "sha256")
+    return (signing_input + b"." + _b64url(signature)).decode("ascii")
+
+
 async def authenticate_user(
     user_repo: UserRepositoryPort,
     email: str,
@@ -72,14 +190,59 @@ async def authenticate_user(
     Returns:
         User si authentification reussie, None sinon
     """
-    user = await user_repo.get_by_email(email)
+    # Lecture sans cache: hash et statut disabled a jour
+    user = await user_repo.get_by_email_fresh(email)
     if not user:
+        # Meme cout bcrypt qu'un vrai echec: pas d'oracle d'enumeration par le temps
+        await _run_bcrypt(_check_dummy_password, password)
         return None
-    if not verify_password(password, user.hashed_password):
+    if not await verify_password(password, user.hashed_password):
         return None
+    stored_cost = _parse_bcrypt_cost(user.hashed_password)
+    if stored_cost is None or stored_cost < _bcrypt_rounds:
+        # Rehash au cout courant en arriere-plan: la connexion n'attend pas.
+        # Uniquement a la hausse: un worker calibre plus bas ne degrade jamais un hash
+        task = asyncio.create_task(
+            _rehash_password(user_repo, user.user_id, password, stored_cost)
+        )
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
     return user
 
 
+async def _rehash_password(
+    user_repo: UserRepositoryPort, user_id: str, password: str, old_cost: Optional[int]
+) -> None:
+    try:
+        hashed_password = await get_password_hash(password)
+        await user_repo.update_password_hash(user_id, hashed_password)
+        logger.info(
+            f"Password hash upgraded for user {user_id}: cost {old_cost} -> {_bcrypt_rounds}"
+        )
+    except Exception as e:
+        logger.warning(f"Password rehash failed for user {user_id}: {e}")
+
+
+def user_from_token(token_data: TokenData) -> Optional[User]:
+    """
+    Reconstruit l'utilisateur a partir des claims du token, sans acces base.
+
+    Returns:
+        User, ou None si le token ne porte pas les claims utilisateur
+        (anciens tokens): l'appelant doit alors faire le lookup en base.
+    """
+    if token_data.user_id is None or token_data.disabled is None:
+        return None
+    return User(
+        user_id=token_data.user_id,
+        email=token_data.email,
+        hashed_password="",
+        company_id=token_data.company_id,
+        full_name=token_data.full_name,
+        disabled=token_data.disabled,
+    )
+
+
 def decode_token(token: str) -> TokenData:
     """
     Decode et valide un token JWT.
@@ -92,6 +255,16 @@ def decode_token(token: str) -> TokenData:
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+    cached = _token_cache.get(token)
+    if cached is not None:
+        token_data, exp = cached
+        # Le TTL du cache ne doit jamais prolonger un token expire
+        if exp is None or time.time() < exp:
+            return token_data
+        _token_cache.pop(token, None)
+        raise credentials_exception
+
     try:
         payload = jwt.decode(
             token,
@@ -102,7 +275,15 @@ def decode_token(token: str) -> TokenData:
         company_id: str = payload.get("company_id")
         if email is None:
             raise credentials_exception
-        return TokenData(email=email, company_id=company_id)
+        token_data = TokenData(
+            email=email,
+            company_id=company_id,
+            user_id=payload.get("uid"),
+            full_name=payload.get("full_name"),
+            disabled=payload.get("disabled"),
+        )
+        _token_cache[token] = (token_data, payload.get("exp"))
+        return token_data
     except InvalidTokenError:
         raise credentials_exception
 
@@ -140,6 +321,10 @@ class AuthDependency:
 
         token_data = decode_token(token)
 
+        user = user_from_token(token_data)
+        if user is not None:
+            return user
+
         user = await self.user_repo.get_by_email(token_data.email)
         if user is None:
             raise credentials_exception
@@ -4,12 +4,16 @@ FastAPI Application - Agent Conversationnel avec SSE + Redis Pub/Sub
 Usage:
     uvicorn backend.main:app --reload --port 8000
 """
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import AsyncExitStack, asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
+from src.config import settings
 from .infrastructure.container import Container
+from .infrastructure.security import calibrate_bcrypt_rounds
 from .routes import chat_router, stream_router, documents_router, auth_router
 
 container = Container()
@@ -17,18 +21,40 @@ container = Container()
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Gestion du cycle de vie de l'application."""
-    broker = container.event_broker()
-    await broker.connect()
-    yield
-    await broker.disconnect()
+    """
+    Gestion du cycle de vie de l'application.
+
+    Les clients partages (pool PostgreSQL, broker Redis, pool ARQ) sont des
+    Singletons du container: crees une fois, ouverts ici et fermes a l'arret,
+    y compris lors des rechargements (--reload) ou en cas d'erreur.
+    """
+    if settings.BCRYPT_AUTO_CALIBRATE:
+        await asyncio.to_thread(calibrate_bcrypt_rounds, settings.BCRYPT_MAX_MS)
+    # Chaque fermeture est enregistree juste apres l'ouverture: un echec au
+    # demarrage ferme ce qui est deja ouvert, et chaque fermeture s'execute
+    # meme si une autre echoue
+    async with AsyncExitStack() as stack:
+        db_pool = container.db_pool()
+        await db_pool.open()
+        stack.push_async_callback(db_pool.close)
+        # Pool psycopg du vector store (ouvert au premier usage, ferme a l'arret)
+        stack.push_async_callback(container.vector_store().aclose)
+        await container.postgres_user_repository().hydrate_email_bloom()
+        broker = container.event_broker()
+        await broker.connect()
+        stack.push_async_callback(broker.disconnect)
+        job_queue = container.job_queue()
+        await job_queue.startup()
+        stack.push_async_callback(job_queue.close)
+        yield
 
 
 app = FastAPI(
     title="RAG Conversational Agent API",
     description="API pour interagir avec l'agent conversationnel via SSE",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(
@@ -8,6 +8,7 @@ from fastapi.security import OAuth2PasswordRequestForm
 from dependency_injector.wiring import inject, Provide
 
 from src.config import settings
+from backend.domain.exceptions import EmailAlreadyRegisteredError
 from backend.domain.models.user import Token, User, UserCreate, UserResponse
 from backend.domain.ports.user_repository_port import UserRepositoryPort
 from backend.domain.ports.company_repository_port import CompanyRepositoryPort
@@ -50,7 +51,13 @@ async def login_for_access_token(
 
     access_token_expires = timedelta(minutes=settings.JWT_ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": user.email, "company_id": user.company_id},
+        data={
+            "sub": user.email,
+            "company_id": user.company_id,
+            "uid": user.user_id,
+            "full_name": user.full_name,
+            "disabled": user.disabled,
+        },
         expires_delta=access_token_expires,
     )
     return Token(access_token=access_token, token_type="bearer")
@@ -77,12 +84,18 @@ async def register_user(
     # Creer l'utilisateur avec le mot de passe hashe
     user = User.create(
         email=user_data.email,
-        hashed_password=get_password_hash(user_data.password),
+        hashed_password=await get_password_hash(user_data.password),
         company_id=user_data.company_id,
         full_name=user_data.full_name,
     )
 
-    await user_repo.create(user)
+    try:
+        await user_repo.create(user)
+    except EmailAlreadyRegisteredError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered",
+        )
 
     return UserResponse(
         user_id=user.user_id,
@@ -90,7 +103,7 @@ async def register_user(
         company_id=user.company_id,
         full_name=user.full_name,
         disabled=user.disabled,
-        created_at=user.created_at.isoformat() if user.created_at else None,
+        created_at=user.created_at,
     )
 
 
@@ -107,7 +120,8 @@ async def read_users_me(
     """
     token_data = decode_token(token)
 
-    user = await user_repo.get_by_email(token_data.email)
+    # Statut disabled lu en base (pas de cache)
+    user = await user_repo.get_by_email_fresh(token_data.email)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -127,7 +141,7 @@ async def read_users_me(
         company_id=user.company_id,
         full_name=user.full_name,
         disabled=user.disabled,
-        created_at=user.created_at.isoformat() if user.created_at else None,
+        created_at=user.created_at,
     )
 
 
@@ -1,12 +1,12 @@
 """Route POST /chat - Envoi de messages utilisateur."""
-import json
-from datetime import datetime, timezone
+import time
 
+import orjson
 from fastapi import APIRouter, Depends, HTTPException
 from dependency_injector.wiring import inject, Provide
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
-from backend.domain.models.chat import ChatResponse
+from backend.domain.models.chat import ChatEmail, ChatResponse, ChatText
 from backend.domain.ports.event_broker_port import EventBrokerPort
 from backend.infrastructure.container import Container
 from backend.routes.dependencies import CurrentUser
@@ -14,8 +14,11 @@ from backend.routes.dependencies import CurrentUser
 
 class ChatMessageRequest(BaseModel):
     """Schema de requete pour envoyer un message."""
-    message: str
-    email: str
+
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
+    message: ChatText
+    email: ChatEmail
 
 router = APIRouter()
 
@@ -33,18 +36,18 @@ async def send_message(
     Le message est publie sur le channel inbox:{email} pour etre
     traite par le worker. L'email et company_id sont extraits du token JWT.
     """
-    if not request.message.strip():
+    if not request.message:
         raise HTTPException(status_code=400, detail="Le message ne peut pas etre vide")
 
     user_email = request.email
     channel = f"inbox:{user_email}"
 
-    payload = json.dumps({
+    payload = orjson.dumps({
         "company_id": current_user.company_id,
         "email": user_email,
         "message": request.message,
-        "timestamp": datetime.now(timezone.utc).isoformat()
-    })
+        "timestamp": time.time_ns() // 1_000_000,  # epoch ms (UTC)
+    }).decode()
 
     await broker.publish(channel=channel, message=payload)
 
@@ -1,6 +1,7 @@
 """Dependencies FastAPI pour l'authentification."""
 
-from typing import Annotated
+from dataclasses import replace
+from typing import Annotated, Optional
 
 from fastapi import Depends, HTTPException, status
 from dependency_injector.wiring import inject, Provide
@@ -8,20 +9,42 @@ from dependency_injector.wiring import inject, Provide
 from backend.domain.models.user import User
 from backend.domain.ports.user_repository_port import UserRepositoryPort
 from backend.infrastructure.container import Container
-from backend.infrastructure.security import oauth2_scheme, decode_token
+from backend.infrastructure.security import oauth2_scheme, decode_token, user_from_token
+
+
+# Utilisateur virtuel des tokens widget: seul company_id varie par requete
+_WIDGET_USER = User(
+    user_id="widget",
+    email="widget@system",
+    hashed_password="",
+    company_id="",
+    full_name="Widget User",
+    disabled=False,
+)
 
 
 @inject
+async def _lookup_user(
+    email: str,
+    user_repo: UserRepositoryPort = Provide[Container.user_repository],
+) -> Optional[User]:
+    """Lookup en base, reserve aux anciens tokens sans claims utilisateur."""
+    return await user_repo.get_by_email(email)
+
+
 async def get_current_user(
     token: Annotated[str, Depends(oauth2_scheme)],
-    user_repo: UserRepositoryPort = Depends(Provide[Container.user_repository]),
 ) -> User:
     """
     Dependency FastAPI: extrait l'utilisateur courant du token JWT.
 
     Supporte deux types de tokens:
-    - Token utilisateur: sub=email → lookup en base
     - Token widget: sub="widget" → utilisateur virtuel avec company_id
+    - Token utilisateur: sub=email → User reconstruit depuis les claims
+      (lookup en base uniquement pour les anciens tokens sans claims)
+
+    Aucun provider n'est resolu par requete: le repository n'est sollicite
+    que pour le fallback des anciens tokens.
 
     Usage dans les routes:
         @router.get("/protected")
@@ -30,29 +53,24 @@ async def get_current_user(
         ):
             ...
     """
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-
     token_data = decode_token(token)
 
     # Token widget (via API key) - pas de lookup user
     if token_data.email == "widget":
-        return User(
-            user_id="widget",
-            email="widget@system",
-            hashed_password="",
-            company_id=token_data.company_id,
-            full_name="Widget User",
-            disabled=False,
-        )
+        return replace(_WIDGET_USER, company_id=token_data.company_id)
+
+    # Token utilisateur standard - claims du token, sinon lookup en base
+    user = user_from_token(token_data)
+    if user is not None:
+        return user
 
-    # Token utilisateur standard - lookup en base
-    user = await user_repo.get_by_email(token_data.email)
+    user = await _lookup_user(token_data.email)
     if user is None:
-        raise credentials_exception
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     return user
 
 
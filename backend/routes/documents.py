@@ -1,10 +1,13 @@
 """Routes CRUD pour la gestion des documents PDF."""
 
-import asyncio
-import json
 import logging
+import os
+from contextlib import aclosing
+from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File
+from fastapi.responses import ORJSONResponse
 from sse_starlette.sse import EventSourceResponse
 from dependency_injector.wiring import inject, Provide
 
@@ -15,27 +18,30 @@ from backend.domain.exceptions import (
     DocumentNotFoundError,
     InvalidFileTypeError,
     FileTooLargeError,
-    PageLimitExceededError,
 )
 from backend.domain.models.document import (
-    DocumentResponse,
     DocumentListResponse,
     DocumentUploadResponse,
     DocumentDeleteResponse,
 )
-from backend.domain.ports.document_repository_port import DocumentRepositoryPort
 from backend.domain.ports.event_broker_port import EventBrokerPort
-from backend.domain.ports.file_storage_port import FileStoragePort
-from backend.domain.ports.job_queue_port import JobQueuePort
-from backend.domain.ports.pdf_analyzer_port import PdfAnalyzerPort
 from backend.infrastructure.container import Container
+from backend.routes.sse import with_heartbeats
 from backend.routes.dependencies import CurrentUser
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-HEARTBEAT_INTERVAL = 30  # secondes
+
+def _upload_size(file: UploadFile) -> int:
+    """Taille du fichier uploade, sans le lire en memoire."""
+    if file.size is not None:
+        return file.size
+    file.file.seek(0, os.SEEK_END)
+    size = file.file.tell()
+    file.file.seek(0)
+    return size
 
 
 @router.post("/documents/upload", response_model=DocumentUploadResponse)
@@ -43,28 +49,23 @@ HEARTBEAT_INTERVAL = 30  # secondes
 async def upload_document(
     current_user: CurrentUser,
     file: UploadFile = File(...),
-    repo: DocumentRepositoryPort = Depends(Provide[Container.document_repository]),
-    job_queue: JobQueuePort = Depends(Provide[Container.job_queue]),
-    storage: FileStoragePort = Depends(Provide[Container.file_storage]),
-    pdf_analyzer: PdfAnalyzerPort = Depends(Provide[Container.pdf_analyzer]),
+    uc: UploadDocumentUseCase = Depends(Provide[Container.upload_document_uc]),
 ):
     """Upload un document PDF: valide, upload GCS, enqueue vectorisation."""
     company_id = current_user.company_id
 
-    uc = UploadDocumentUseCase(repo, job_queue, storage, pdf_analyzer)
     try:
         document = await uc.execute(
             company_id=company_id,
             filename=file.filename or "unknown.pdf",
-            content=await file.read(),
+            file=file.file,
+            size_bytes=_upload_size(file),
             content_type=file.content_type,
         )
     except InvalidFileTypeError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except FileTooLargeError as e:
         raise HTTPException(status_code=413, detail=str(e))
-    except PageLimitExceededError as e:
-        raise HTTPException(status_code=413, detail=str(e))
 
     return DocumentUploadResponse(
         status="queued",
@@ -92,60 +93,68 @@ async def document_progress(
         channel = f"document_progress:{document_id}"
 
         async with broker.subscribe(channel=channel) as subscription:
-            while True:
-                try:
-                    raw = await asyncio.wait_for(
-                        subscription.get(),
-                        timeout=HEARTBEAT_INTERVAL,
-                    )
-
-                    data = json.loads(raw)
-                    yield {"event": "progress", "data": json.dumps(data)}
-
-                    if data.get("done", False):
-                        break
-
-                except asyncio.TimeoutError:
-                    yield {"event": "heartbeat", "data": ""}
-                except Exception as e:
-                    yield {
-                        "event": "error",
-                        "data": json.dumps({"error": str(e)}),
-                    }
-                    break
+            try:
+                async with aclosing(with_heartbeats(subscription)) as events:
+                    async for raw in events:
+                        if raw is None:
+                            yield {"event": "heartbeat", "data": ""}
+                            continue
+
+                        # Le message est deja du JSON: on le relaie tel quel
+                        yield {"event": "progress", "data": raw}
+
+                        if orjson.loads(raw).get("done", False):
+                            break
+            except Exception as e:
+                yield {
+                    "event": "error",
+                    "data": orjson.dumps({"error": str(e)}).decode(),
+                }
 
     return EventSourceResponse(event_generator())
 
 
-@router.get("/documents", response_model=DocumentListResponse)
+@router.get(
+    "/documents",
+    response_class=ORJSONResponse,
+    responses={200: {"model": DocumentListResponse}},
+)
 @inject
 async def list_documents(
     current_user: CurrentUser,
-    repo: DocumentRepositoryPort = Depends(Provide[Container.document_repository]),
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    uc: ListDocumentsUseCase = Depends(Provide[Container.list_documents_uc]),
 ):
-    """Liste tous les documents d'une entreprise."""
+    """
+    Liste les documents d'une entreprise (plus recents d'abord).
+
+    Sans `limit`, tous les documents sont retournes; `total` est toujours le
+    nombre de documents de l'entreprise, pas la taille de la page.
+
+    Les lignes viennent de la base: elles sont serialisees directement par
+    orjson, sans passer par DocumentResponse ni par la revalidation du
+    response_model (le schema reste documente dans OpenAPI).
+    """
     company_id = current_user.company_id
 
-    uc = ListDocumentsUseCase(repo)
-    documents = await uc.execute(company_id)
-
-    return DocumentListResponse(
-        documents=[
-            DocumentResponse(
-                document_id=d.document_id,
-                company_id=d.company_id,
-                filename=d.filename,
-                size_bytes=d.size_bytes,
-                num_pages=d.num_pages,
-                content_type=d.content_type,
-                status=d.status,
-                error_message=d.error_message,
-                uploaded_at=d.uploaded_at.isoformat() if d.uploaded_at else "",
-            )
-            for d in documents
-        ],
-        total=len(documents),
-    )
+    documents, total = await uc.execute(company_id, limit=limit, offset=offset)
+
+    rows = [
+        {
+            "document_id": d.document_id,
+            "company_id": d.company_id,
+            "filename": d.filename,
+            "size_bytes": d.size_bytes,
+            "num_pages": d.num_pages,
+            "content_type": d.content_type,
+            "status": d.status,
+            "error_message": d.error_message,
+            "uploaded_at": d.uploaded_at_ms,  # epoch ms, formate par le client
+        }
+        for d in documents
+    ]
+    return ORJSONResponse({"documents": rows, "total": total})
 
 
 @router.delete("/documents/{document_id}", response_model=DocumentDeleteResponse)
@@ -153,13 +162,10 @@ async def list_documents(
 async def delete_document(
     document_id: str,
     current_user: CurrentUser,
-    storage=Depends(Provide[Container.file_storage]),
-    repo: DocumentRepositoryPort = Depends(Provide[Container.document_repository]),
-    vector_store=Depends(Provide[Container.vector_store]),
+    uc: DeleteDocumentUseCase = Depends(Provide[Container.delete_document_uc]),
 ):
     """Supprime un document (GCS + metadonnees PostgreSQL + vecteurs)."""
     company_id = current_user.company_id
-    uc = DeleteDocumentUseCase(storage, repo, vector_store)
     try:
         await uc.execute(document_id, company_id)
     except DocumentNotFoundError:
@@ -0,0 +1,50 @@
+"""Utilitaires partages par les endpoints SSE."""
+import asyncio
+from typing import AsyncIterator, Optional
+
+from backend.domain.ports.event_broker_port import Subscription
+
+HEARTBEAT_INTERVAL = 30  # secondes
+
+_HEARTBEAT = object()
+
+
+async def with_heartbeats(
+    subscription: Subscription,
+    interval: float = HEARTBEAT_INTERVAL,
+) -> AsyncIterator[Optional[str]]:
+    """
+    Fusionne les messages d'un abonnement et des heartbeats periodiques.
+
+    Yield chaque message brut, ou None quand un heartbeat doit etre envoye.
+    Un lecteur et un timer long-vivants alimentent une seule queue: aucun
+    timer n'est cree puis annule a chaque message (contrairement a wait_for).
+    Une exception levee par subscription.get() est re-levee a l'appelant.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def read() -> None:
+        try:
+            while True:
+                queue.put_nowait(await subscription.get())
+        except Exception as e:
+            queue.put_nowait(e)
+
+    async def beat() -> None:
+        while True:
+            await asyncio.sleep(interval)
+            queue.put_nowait(_HEARTBEAT)
+
+    tasks = [asyncio.create_task(read()), asyncio.create_task(beat())]
+    try:
+        while True:
+            item = await queue.get()
+            if item is _HEARTBEAT:
+                yield None
+            elif isinstance(item, Exception):
+                raise item
+            else:
+                yield item
+    finally:
+        for task in tasks:
+            task.cancel()
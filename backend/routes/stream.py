@@ -1,18 +1,17 @@
 """Route GET /stream/{email} - SSE pour recevoir les reponses."""
-import asyncio
-import json
+from contextlib import aclosing
 
+import orjson
 from fastapi import APIRouter, Depends
 from sse_starlette.sse import EventSourceResponse
 from dependency_injector.wiring import inject, Provide
 
 from backend.domain.ports.event_broker_port import EventBrokerPort
 from backend.infrastructure.container import Container
+from backend.routes.sse import with_heartbeats
 
 router = APIRouter()
 
-HEARTBEAT_INTERVAL = 30  # secondes
-
 
 @router.get("/stream/{email}")
 @inject
@@ -33,26 +32,22 @@ async def stream_response(
         channel = f"outbox:{email}"
 
         async with broker.subscribe(channel=channel) as subscription:
-            while True:
-                try:
-                    raw = await asyncio.wait_for(
-                        subscription.get(),
-                        timeout=HEARTBEAT_INTERVAL
-                    )
-
-                    data = json.loads(raw)
-                    yield {"event": "message", "data": json.dumps(data)}
-
-                    if data.get("done", False):
-                        break
-
-                except asyncio.TimeoutError:
-                    yield {"event": "heartbeat", "data": ""}
-                except Exception as e:
-                    yield {
-                        "event": "error",
-                        "data": json.dumps({"error": str(e)})
-                    }
-                    break
+            try:
+                async with aclosing(with_heartbeats(subscription)) as events:
+                    async for raw in events:
+                        if raw is None:
+                            yield {"event": "heartbeat", "data": ""}
+                            continue
+
+                        # Le message est deja du JSON: on le relaie tel quel
+                        yield {"event": "message", "data": raw}
+
+                        if orjson.loads(raw).get("done", False):
+                            break
+            except Exception as e:
+                yield {
+                    "event": "error",
+                    "data": orjson.dumps({"error": str(e)}).decode()
+                }
 
     return EventSourceResponse(event_generator())
@@ -8,12 +8,18 @@ Note: Le worker n'a pas de job_queue provider car ARQ gere la consommation
 en interne. Le container fournit uniquement les dependances metier.
 """
 
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
 from dependency_injector import containers, providers
 
 from src.config import settings
-from backend.infrastructure.adapters.broadcast_adapter import BroadcastEventBroker
+from backend.infrastructure.adapters.redis_event_broker import RedisEventBroker
 from backend.infrastructure.adapters.gcs_storage_adapter import GCSFileStorageAdapter
+from backend.infrastructure.adapters.pypdf_analyzer_adapter import PypdfAnalyzerAdapter
+from backend.infrastructure.db.pool import create_pool
 from backend.infrastructure.repositories.document_repository import PostgresDocumentRepository
+from backend.worker.use_cases.process_document import warm_up_pdf_process
 from src.infrastructure.adapters.pgvector_adapter import PGVectorAdapter
 
 
@@ -22,16 +28,23 @@ class WorkerContainer(containers.DeclarativeContainer):
     Container DI du worker.
 
     Regroupe les adapters necessaires pour la vectorisation:
+    - Pool de connexions PostgreSQL
     - Event broker (Redis pub/sub for progress)
     - File storage (GCS - download)
+    - PDF analyzer (comptage des pages, quota)
+    - Pool de processus CPU (parsing/decoupage PDF)
     - Document repository (PostgreSQL)
     - Vector store (PGVector)
     """
 
+    # Database Pool (ouvert au startup du worker)
+    db_pool = providers.Singleton(create_pool)
+
     # Event Broker (for SSE progress)
     event_broker = providers.Singleton(
-        BroadcastEventBroker,
+        RedisEventBroker,
         url=settings.REDIS_URL,
+        max_connections=settings.REDIS_POOL_SIZE,
     )
 
     # File Storage
@@ -42,9 +55,27 @@ class WorkerContainer(containers.DeclarativeContainer):
         service_account_key=settings.GCS_SERVICE_ACCOUNT_KEY,
     )
 
+    # PDF Analyzer (comptage des pages avant vectorisation)
+    pdf_analyzer = providers.Singleton(
+        PypdfAnalyzerAdapter,
+    )
+
+    # Pool de processus pour le parsing PDF, partage par tous les jobs
+    # (demarre au startup, ferme au shutdown du worker)
+    # spawn explicite: le processus parent a deja des threads (pool psycopg,
+    # asyncio.to_thread) qu'un fork dupliquerait dans un etat incoherent, et
+    # chaque enfant initialise MuPDF proprement via warm_up_pdf_process
+    cpu_pool = providers.Singleton(
+        ProcessPoolExecutor,
+        max_workers=settings.PDF_WORKERS,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=warm_up_pdf_process,
+    )
+
     # Document Repository
     document_repository = providers.Singleton(
         PostgresDocumentRepository,
+        pool=db_pool,
     )
 
     # Vector Store
@@ -1,11 +1,13 @@
 """Configuration du worker ARQ."""
 
+import asyncio
 import logging
+import os
 
 from src.config import settings
 from backend.infrastructure.adapters.arq_job_queue_adapter import parse_redis_settings
 from backend.worker.container import WorkerContainer
-from backend.worker.tasks import process_document
+from backend.worker.tasks import process_document, purge_document_vectors
 from backend.worker.use_cases.process_document import ProcessDocumentUseCase
 
 logger = logging.getLogger(__name__)
@@ -19,31 +21,52 @@ async def startup(ctx: dict) -> None:
     )
 
     container = WorkerContainer()
+    vector_store = container.vector_store()
+    # Tables PGVector + schema des embeddings (halfvec, index) avant le premier job
+    await asyncio.to_thread(vector_store.ensure_schema)
+    db_pool = container.db_pool()
+    await db_pool.open()
     broker = container.event_broker()
     await broker.connect()
+    cpu_pool = container.cpu_pool()
+    # Demarre tous les processus du pool maintenant (imports faits par l'initializer)
+    loop = asyncio.get_running_loop()
+    await asyncio.gather(*(
+        loop.run_in_executor(cpu_pool, os.getpid)
+        for _ in range(settings.PDF_WORKERS)
+    ))
 
     ctx["process_use_case"] = ProcessDocumentUseCase(
         repo=container.document_repository(),
         storage=container.file_storage(),
         event_broker=broker,
-        vector_store=container.vector_store(),
+        vector_store=vector_store,
+        pdf_analyzer=container.pdf_analyzer(),
+        cpu_pool=cpu_pool,
     )
+    ctx["vector_store"] = vector_store
     ctx["broker"] = broker
+    ctx["db_pool"] = db_pool
+    ctx["cpu_pool"] = cpu_pool
     logger.info("Worker dependencies initialized")
 
 
 async def shutdown(ctx: dict) -> None:
     """Nettoie les ressources du worker a l'arret."""
     await ctx["broker"].disconnect()
+    await ctx["vector_store"].aclose()
+    await ctx["db_pool"].close()
+    ctx["cpu_pool"].shutdown(wait=False, cancel_futures=True)
     logger.info("Worker shut down")
 
 
 class WorkerSettings:
     """Configuration ARQ du worker de vectorisation."""
 
-    functions = [process_document]
+    functions = [process_document, purge_document_vectors]
     on_startup = startup
     on_shutdown = shutdown
     redis_settings = parse_redis_settings(settings.REDIS_URL)
     max_jobs = 5
+    poll_delay = settings.ARQ_POLL_DELAY  # latence max de prise en charge d'un job
     job_timeout = 600  # 10 minutes
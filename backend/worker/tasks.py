@@ -2,6 +2,8 @@
 
 import logging
 
+from arq import Retry
+
 logger = logging.getLogger(__name__)
 
 
@@ -18,3 +20,19 @@ async def process_document(ctx: dict, document_id: str, company_id: str, gcs_pat
         "company_id": company_id,
         "gcs_path": gcs_path,
     })
+
+
+async def purge_document_vectors(ctx: dict, document_id: str) -> None:
+    """
+    Tache ARQ: purge differee des vecteurs d'un document supprime.
+
+    Enqueue par DeleteDocumentUseCase quand la suppression des vecteurs
+    echoue. Re-essaie avec un delai croissant (max_tries ARQ).
+    """
+    try:
+        deleted = await ctx["vector_store"].delete_by_document_id(document_id)
+    except Exception as e:
+        job_try = ctx.get("job_try", 1)
+        logger.warning(f"Vector purge failed for {document_id} (try {job_try}): {e}")
+        raise Retry(defer=job_try * 10) from e
+    logger.info(f"Purged {deleted} vectors for document {document_id}")
@@ -1,30 +1,201 @@
 """Use case: Vectorisation d'un document PDF dans le worker."""
 
-import json
+import asyncio
+import hashlib
 import logging
 import os
 import tempfile
+from collections.abc import Iterator
+from concurrent.futures import Executor
+from functools import partial
+from typing import Optional
 
+import orjson
+import pymupdf
 from langchain_community.document_loaders import PyPDFLoader
+from langchain_core.documents import Document as LangchainDocument
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
+from backend.domain.exceptions import PageLimitExceededError
 from backend.domain.models.document import DocumentStatus
 from backend.domain.ports.document_repository_port import DocumentRepositoryPort
 from backend.domain.ports.event_broker_port import EventBrokerPort
 from backend.domain.ports.file_storage_port import FileStoragePort
+from backend.domain.ports.pdf_analyzer_port import PdfAnalyzerPort
 from src.config import settings
 from src.domain.ports.vector_store_port import VectorStorePort
 
 logger = logging.getLogger(__name__)
 
-BATCH_SIZE = 10
+# Approximation du nombre de caracteres par token pour le budget des batches
+CHARS_PER_TOKEN = 4
+# Ecart minimal (en %) entre deux evenements de progression publies pendant l'indexation
+PROGRESS_MIN_DELTA = 5
+# Taille minimale d'une plage de pages extraite par un processus du pool
+MIN_PAGES_PER_TASK = 8
+
+# Parametres statiques: un seul splitter par processus, reutilise pour chaque document
+_SPLITTER = RecursiveCharacterTextSplitter(
+    chunk_size=settings.CHUNK_SIZE,
+    chunk_overlap=settings.CHUNK_OVERLAP,
+    length_function=len,
+    separators=["\n\n", "\n", " ", ""],
+    # Position de chaque chunk dans sa page: permet de retirer le recouvrement
+    # (CHUNK_OVERLAP) lors de la fusion des petits chunks
+    add_start_index=True,
+)
+
+
+def warm_up_pdf_process() -> None:
+    """
+    Initializer des processus du pool PDF (demarres en mode spawn, voir
+    WorkerContainer.cpu_pool).
+
+    Importe explicitement les modules du decoupage et les exerce une fois
+    (contexte MuPDF, expressions du splitter): ce cout est paye au demarrage
+    du processus plutot que par le premier document traite.
+    """
+    import pymupdf
+
+    pymupdf.open().close()
+    _SPLITTER.split_text("warm up\n\nwarm up")
+
+
+def _load_pdf_pages(
+    pdf_path: str, start: int = 0, stop: Optional[int] = None,
+) -> list[LangchainDocument]:
+    """Extrait le texte des pages [start, stop) selon settings.PDF_BACKEND."""
+    if settings.PDF_BACKEND == "pypdf":
+        return PyPDFLoader(pdf_path).load()
+
+    with pymupdf.open(pdf_path) as pdf:
+        stop = pdf.page_count if stop is None else min(stop, pdf.page_count)
+        return [
+            LangchainDocument(
+                page_content=pdf[page_number].get_text("text"),
+                metadata={"source": pdf_path, "page": page_number},
+            )
+            for page_number in range(start, stop)
+        ]
+
+
+def chunk_pdf(
+    pdf_path: str,
+    filename: str,
+    company_id: str,
+    document_id: str,
+    start: int = 0,
+    stop: Optional[int] = None,
+) -> list:
+    """
+    Charge les pages [start, stop) d'un PDF depuis le disque et les decoupe en chunks.
+
+    Fonction de module (picklable): executee dans le pool de processus du worker.
+    Le decoupage se fait page par page, donc des plages disjointes produisent
+    les memes chunks qu'un traitement du document entier. La fusion des petits
+    chunks (_finalize_chunks) se fait apres concatenation des plages.
+    """
+    documents = _load_pdf_pages(pdf_path, start, stop)
+    chunks = _SPLITTER.split_documents(documents)
+
+    common_metadata = {"company_id": company_id, "document_id": document_id, "source": filename}
+    for chunk in chunks:
+        chunk.metadata.update(common_metadata)
+
+    return chunks
+
+
+def _finalize_chunks(chunks: list[LangchainDocument]) -> list[LangchainDocument]:
+    """
+    Fusionne les petits chunks du document entier et calcule leur empreinte.
+
+    Appele une fois sur les chunks de toutes les plages concatenees: le resultat
+    ne depend pas du nombre de plages (PDF_WORKERS).
+    """
+    chunks = _merge_small_chunks(
+        chunks, min_size=settings.MIN_CHUNK_SIZE, max_size=settings.CHUNK_SIZE,
+    )
+    for chunk in chunks:
+        chunk.metadata.pop("start_index", None)
+        # Empreinte du contenu: evite de re-calculer l'embedding d'un chunk deja indexe
+        chunk.metadata["content_hash"] = hashlib.sha256(chunk.page_content.encode()).hexdigest()
+    return chunks
+
+
+def _merge_small_chunks(
+    chunks: list[LangchainDocument], min_size: int, max_size: int,
+) -> list[LangchainDocument]:
+    """
+    Fusionne les chunks trop courts avec leur predecesseur (une passe, O(n)).
+
+    Un chunk est fusionne si lui ou son predecesseur fait moins de min_size
+    caracteres et que le resultat tient dans max_size: moins d'embeddings a
+    calculer et a stocker. Le chunk fusionne garde les metadonnees (page) du premier.
+    Le splitter borne deja la taille des chunks: aucun re-decoupage n'est necessaire.
+
+    Deux chunks consecutifs d'une meme page partagent jusqu'a CHUNK_OVERLAP
+    caracteres (start_index du splitter): ce recouvrement n'est garde qu'une fois.
+    """
+    merged: list[LangchainDocument] = []
+    # Fin (page, position) du dernier morceau ajoute a merged[-1]
+    last_page, last_end = None, None
+    for chunk in chunks:
+        text = chunk.page_content
+        page = chunk.metadata.get("page")
+        start = chunk.metadata.get("start_index")
+        if merged:
+            previous = merged[-1]
+            overlap = 0
+            if page == last_page and start is not None and last_end is not None:
+                overlap = max(0, min(last_end - start, len(text)))
+            joined = (
+                previous.page_content + text[overlap:] if overlap
+                else previous.page_content + "\n" + text
+            )
+            is_small = min(len(previous.page_content), len(text)) < min_size
+            if is_small and len(joined) <= max_size:
+                previous.page_content = joined
+                last_page, last_end = page, None if start is None else start + len(text)
+                continue
+        merged.append(chunk)
+        last_page, last_end = page, None if start is None else start + len(text)
+    return merged
+
+
+def _token_batches(chunks: list, max_tokens: int) -> Iterator[list]:
+    """
+    Regroupe les chunks en batches remplissant au mieux le budget de tokens.
+
+    Glouton, dans l'ordre: un batch est emis des que le chunk suivant ferait
+    depasser max_tokens (un chunk seul plus gros que le budget forme son propre batch).
+    Moins d'allers-retours vers le modele d'embedding pour les chunks courts.
+    """
+    batch: list = []
+    batch_tokens = 0
+    for chunk in chunks:
+        tokens = len(chunk.page_content) // CHARS_PER_TOKEN
+        if batch and batch_tokens + tokens > max_tokens:
+            yield batch
+            batch, batch_tokens = [], 0
+        batch.append(chunk)
+        batch_tokens += tokens
+    if batch:
+        yield batch
+
+
+def _page_ranges(num_pages: int, parts: int) -> list[tuple[int, int]]:
+    """Decoupe [0, num_pages) en au plus `parts` plages contigues (MIN_PAGES_PER_TASK pages min)."""
+    parts = max(1, min(parts, num_pages // MIN_PAGES_PER_TASK))
+    step = max(1, -(-num_pages // parts))  # division entiere arrondie au superieur
+    return [(start, min(start + step, num_pages)) for start in range(0, num_pages, step)]
 
 
 class ProcessDocumentUseCase:
     """
     Pipeline de vectorisation d'un document PDF:
-    1. Telecharge le fichier depuis GCS
-    2. Chunk le PDF (PyPDFLoader + RecursiveCharacterTextSplitter)
+    1. Telecharge le fichier depuis GCS, compte les pages et verifie le quota
+       (hors du chemin de la requete d'upload)
+    2. Chunk le PDF (PyMuPDF ou PyPDFLoader + RecursiveCharacterTextSplitter)
     3. Stocke les embeddings dans pgvector (par batch avec progression)
     4. Notifie la progression via SSE (Redis pub/sub)
     """
@@ -35,11 +206,17 @@ class ProcessDocumentUseCase:
         storage: FileStoragePort,
         event_broker: EventBrokerPort,
         vector_store: VectorStorePort,
+        pdf_analyzer: PdfAnalyzerPort,
+        cpu_pool: Optional[Executor] = None,
     ):
         self._repo = repo
         self._storage = storage
         self._broker = event_broker
         self._vector_store = vector_store
+        self._pdf_analyzer = pdf_analyzer
+        self._cpu_pool = cpu_pool
+        # Derniere publication de progression en vol, par canal (jobs concurrents)
+        self._last_publish: dict[str, asyncio.Task] = {}
 
     async def execute(self, job_payload: dict) -> None:
         document_id = job_payload["document_id"]
@@ -47,42 +224,115 @@ class ProcessDocumentUseCase:
         gcs_path = job_payload["gcs_path"]
         channel = f"document_progress:{document_id}"
 
+        # Le PDF est streame de GCS vers un fichier temporaire, ouvert par chemin
+        # dans chaque processus du pool (PDF_TMP_DIR=/dev/shm: aucune ecriture disque)
+        with tempfile.NamedTemporaryFile(
+            suffix=".pdf", dir=settings.PDF_TMP_DIR, delete=False
+        ) as tmp:
+            pdf_path = tmp.name
+
         try:
-            file_content = await self._download(document_id, gcs_path, channel)
-            chunks = await self._chunk(document_id, company_id, file_content, channel)
+            # Lecture des metadonnees en parallele du telechargement (latences recouvertes)
+            _, document = await asyncio.gather(
+                self._download(document_id, gcs_path, pdf_path, channel),
+                self._repo.get_by_id(document_id, company_id),
+            )
+            filename = document.filename if document else "unknown.pdf"
+            num_pages = await self._check_page_quota(
+                document_id, company_id, pdf_path, gcs_path
+            )
+            chunks = await self._chunk(
+                document_id, company_id, filename, pdf_path, num_pages, channel
+            )
             await self._embed(document_id, chunks, channel)
             await self._complete(document_id, len(chunks), gcs_path, channel)
         except Exception as e:
             await self._fail(document_id, e, channel)
+        finally:
+            os.unlink(pdf_path)
 
     # ── Pipeline steps ──────────────────────────────────────────────────
 
-    async def _download(self, document_id: str, gcs_path: str, channel: str) -> bytes:
-        """Telecharge le fichier depuis GCS (0% -> 10%)."""
+    async def _download(
+        self, document_id: str, gcs_path: str, pdf_path: str, channel: str,
+    ) -> None:
+        """Telecharge le fichier depuis GCS vers pdf_path (0% -> 10%)."""
         await self._publish_progress(
             channel, document_id, "downloading", 0,
             "Telechargement du fichier..."
         )
-        file_content = await self._storage.download(gcs_path)
+        await self._storage.download_to(gcs_path, pdf_path)
         await self._publish_progress(
             channel, document_id, "downloading", 10,
             "Fichier telecharge"
         )
-        return file_content
+
+    async def _check_page_quota(
+        self, document_id: str, company_id: str, pdf_path: str, gcs_path: str,
+    ) -> int:
+        """
+        Compte les pages et les reserve sur le quota de l'entreprise.
+
+        Returns:
+            Nombre de pages du document
+
+        Raises:
+            PageLimitExceededError: quota depasse (le fichier GCS est supprime)
+        """
+        num_pages = await asyncio.to_thread(self._count_pages, pdf_path)
+        max_pages = settings.MAX_PAGES_PER_COMPANY
+        if await self._repo.record_page_count(
+            document_id, company_id, num_pages, max_pages
+        ):
+            return num_pages
+
+        current_total = await self._repo.get_total_pages(company_id)
+        await self._storage.delete(gcs_path)
+        raise PageLimitExceededError(current_total, num_pages, max_pages)
 
     async def _chunk(
-        self, document_id: str, company_id: str, file_content: bytes, channel: str,
+        self,
+        document_id: str,
+        company_id: str,
+        filename: str,
+        pdf_path: str,
+        num_pages: int,
+        channel: str,
     ) -> list:
-        """Decoupe le PDF en chunks (10% -> 20%)."""
-        await self._repo.update_status(document_id, DocumentStatus.VECTORIZING)
+        """
+        Decoupe le PDF en chunks (10% -> 20%).
+
+        Avec PyMuPDF, les pages sont reparties en plages traitees en parallele
+        par les processus du pool (MuPDF n'est pas thread-safe: un processus
+        par plage, chacun ouvre son propre document).
+        """
+        # Le passage en VECTORIZING s'ecrit pendant le decoupage (RTT recouvert)
+        status_update = asyncio.create_task(
+            self._repo.update_status(document_id, DocumentStatus.VECTORIZING)
+        )
         await self._publish_progress(
             channel, document_id, "vectorizing", 10,
             "Decoupage du document en chunks..."
         )
 
-        document = await self._repo.get_by_id(document_id, company_id)
-        filename = document.filename if document else "unknown.pdf"
-        chunks = self._chunk_pdf(file_content, filename, company_id, document_id)
+        # Parsing + decoupage CPU dans le pool de processus: la boucle reste libre
+        if settings.PDF_BACKEND == "pypdf":
+            ranges = [(0, None)]
+        else:
+            ranges = _page_ranges(num_pages, settings.PDF_WORKERS)
+        loop = asyncio.get_running_loop()
+        try:
+            parts = await asyncio.gather(*(
+                loop.run_in_executor(
+                    self._cpu_pool, chunk_pdf,
+                    pdf_path, filename, company_id, document_id, start, stop,
+                )
+                for start, stop in ranges
+            ))
+        finally:
+            # Toujours attendu: l'ecriture ne peut pas arriver apres COMPLETED/FAILED
+            await status_update
+        chunks = _finalize_chunks([chunk for part in parts for chunk in part])
 
         await self._publish_progress(
             channel, document_id, "vectorizing", 20,
@@ -91,27 +341,79 @@ class ProcessDocumentUseCase:
         return chunks
 
     async def _embed(self, document_id: str, chunks: list, channel: str) -> None:
-        """Stocke les embeddings par batch dans pgvector (20% -> 95%)."""
+        """
+        Stocke les embeddings par batch dans pgvector (20% -> 95%).
+
+        Producteur/consommateurs: le producteur prepare les batches suivants
+        dans une file bornee pendant que EMBED_CONCURRENCY consommateurs
+        attendent les appels d'embedding et les insertions pgvector.
+        """
+        chunks = await self._skip_indexed(document_id, chunks)
         total_chunks = len(chunks)
         if total_chunks == 0:
             return
 
-        batches = [chunks[i:i + BATCH_SIZE] for i in range(0, total_chunks, BATCH_SIZE)]
-        total_batches = len(batches)
+        consumers = settings.EMBED_CONCURRENCY
+        # File bornee: le producteur n'a que quelques batches d'avance
+        queue: asyncio.Queue[list | None] = asyncio.Queue(maxsize=consumers)
+        progress_lock = asyncio.Lock()
+        processed = 0
+        last_published = 20
 
-        for batch_idx, batch in enumerate(batches):
-            await self._vector_store.add_documents(batch)
+        async def produce() -> None:
+            for batch in _token_batches(chunks, settings.EMBED_BATCH_TOKENS):
+                await queue.put(batch)
+            for _ in range(consumers):
+                await queue.put(None)
 
-            progress = 20 + int(((batch_idx + 1) / total_batches) * 75)
-            processed = min((batch_idx + 1) * BATCH_SIZE, total_chunks)
-            await self._publish_progress(
-                channel, document_id, "vectorizing", progress,
-                f"Indexation: {processed}/{total_chunks} chunks"
-            )
+        async def consume() -> None:
+            nonlocal processed, last_published
+            while (batch := await queue.get()) is not None:
+                await self._vector_store.add_documents(batch)
+                # Sous verrou: la progression publiee reste monotone
+                async with progress_lock:
+                    processed += len(batch)
+                    progress = 20 + int((processed / total_chunks) * 75)
+                    # Evenements intermediaires espaces d'au moins PROGRESS_MIN_DELTA %
+                    if progress - last_published < PROGRESS_MIN_DELTA and processed < total_chunks:
+                        continue
+                    last_published = progress
+                    await self._publish_progress(
+                        channel, document_id, "vectorizing", progress,
+                        f"Indexation: {processed}/{total_chunks} chunks"
+                    )
+
+        # TaskGroup: un echec d'insertion annule le producteur et les autres consommateurs
+        try:
+            async with asyncio.TaskGroup() as group:
+                group.create_task(produce())
+                for _ in range(consumers):
+                    group.create_task(consume())
+        except ExceptionGroup as errors:
+            # Remonte l'erreur d'origine (message enregistre par _fail)
+            raise errors.exceptions[0]
+
+    async def _skip_indexed(self, document_id: str, chunks: list) -> list:
+        """
+        Ecarte les chunks dont le contenu est deja indexe pour ce document
+        (job rejoue apres un echec partiel) ou repete dans le document.
+        """
+        existing = await self._vector_store.filter_existing_hashes(
+            document_id, list({chunk.metadata["content_hash"] for chunk in chunks})
+        )
+        remaining = []
+        for chunk in chunks:
+            content_hash = chunk.metadata["content_hash"]
+            if content_hash not in existing:
+                existing.add(content_hash)
+                remaining.append(chunk)
+        if len(remaining) < len(chunks):
+            logger.info(f"Document {document_id}: {len(chunks) - len(remaining)} chunk(s) deja indexe(s) ignore(s)")
+        return remaining
 
     async def _complete(self, document_id: str, total_chunks: int, gcs_path: str, channel: str) -> None:
         """Finalise le traitement et supprime le fichier source de GCS (100%)."""
-        await self._repo.update_status(document_id, DocumentStatus.COMPLETED)
+        await self._repo.mark_completed(document_id, total_chunks)
         await self._storage.delete(gcs_path)
         await self._publish_progress(
             channel, document_id, "completed", 100,
@@ -132,38 +434,9 @@ class ProcessDocumentUseCase:
 
     # ── Helpers ──────────────────────────────────────────────────────────
 
-    def _chunk_pdf(
-        self,
-        content: bytes,
-        filename: str,
-        company_id: str,
-        document_id: str,
-    ) -> list:
-        """Charge un PDF depuis les bytes et le decoupe en chunks."""
-        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
-            tmp.write(content)
-            tmp_path = tmp.name
-
-        try:
-            loader = PyPDFLoader(tmp_path)
-            documents = loader.load()
-
-            splitter = RecursiveCharacterTextSplitter(
-                chunk_size=settings.CHUNK_SIZE,
-                chunk_overlap=settings.CHUNK_OVERLAP,
-                length_function=len,
-                separators=["\n\n", "\n", " ", ""],
-            )
-            chunks = splitter.split_documents(documents)
-
-            for chunk in chunks:
-                chunk.metadata["company_id"] = company_id
-                chunk.metadata["document_id"] = document_id
-                chunk.metadata["source"] = filename
-
-            return chunks
-        finally:
-            os.unlink(tmp_path)
+    def _count_pages(self, pdf_path: str) -> int:
+        with open(pdf_path, "rb") as f:
+            return self._pdf_analyzer.count_pages(f)
 
     async def _publish_progress(
         self,
@@ -174,12 +447,43 @@ class ProcessDocumentUseCase:
         message: str,
         done: bool = False,
     ) -> None:
-        """Publie un evenement de progression via Redis pub/sub."""
-        event = json.dumps({
+        """
+        Publie un evenement de progression via Redis pub/sub.
+
+        Les evenements intermediaires sont publies en tache de fond (le pipeline
+        n'attend pas l'ACK Redis), chaines par canal pour conserver l'ordre.
+        L'evenement final (done=True) attend que les precedents soient partis.
+        """
+        event = orjson.dumps({
             "document_id": document_id,
             "step": step,
             "progress": progress,
             "message": message,
             "done": done,
         })
-        await self._broker.publish(channel=channel, message=event)
+        previous = self._last_publish.get(channel)
+
+        if done:
+            if previous is not None:
+                await previous
+            await self._broker.publish(channel=channel, message=event)
+            return
+
+        task = asyncio.create_task(self._publish_after(previous, channel, event))
+        self._last_publish[channel] = task
+        task.add_done_callback(partial(self._forget_publish, channel))
+
+    def _forget_publish(self, channel: str, task: asyncio.Task) -> None:
+        if self._last_publish.get(channel) is task:
+            del self._last_publish[channel]
+
+    async def _publish_after(
+        self, previous: asyncio.Task | None, channel: str, event: bytes
+    ) -> None:
+        """Publie apres la publication precedente du canal; une erreur est seulement loguee."""
+        if previous is not None:
+            await previous
+        try:
+            await self._broker.publish(channel=channel, message=event)
+        except Exception as e:
+            logger.warning(f"Progress publish failed on {channel}: {e}")
@@ -18,7 +18,7 @@ import argparse
 import asyncio
 import logging
 import sys
-from src.application.simple_agent import SimpleAgent
+from functools import lru_cache
 
 # Configuration du logging
 logging.basicConfig(
@@ -29,13 +29,37 @@ logging.basicConfig(
 logging.getLogger("httpcore").setLevel(logging.WARNING)
 logging.getLogger("httpx").setLevel(logging.WARNING)
 
-from src.infrastructure.container import Container
-from src.config import settings
 
-container = Container()
-container.config.llm_provider.from_value(settings.LLM_PROVIDER)
-container.config.channel_type.from_value(settings.CHANNEL_TYPE)
-container.wire(modules=["src.application.simple_agent"])
+def run_async(coro):
+    """
+    Execute une coroutine sur une nouvelle boucle d'evenements.
+
+    uvloop (libuv, en C) est utilise s'il est installe: en mode serve, la
+    boucle ordonnance tokens, pub/sub Redis et requetes PostgreSQL.
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.run(coro)
+    return asyncio.run(coro, loop_factory=uvloop.new_event_loop)
+
+
+@lru_cache(maxsize=None)
+def get_container():
+    """
+    Cree et cable le container DI au premier besoin.
+
+    Les imports lourds (LangChain, LangGraph, pgvector...) sont faits ici et
+    dans chaque commande: `python main.py --help` ne les paie pas.
+    """
+    from src.config import settings
+    from src.infrastructure.container import Container
+
+    container = Container()
+    container.config.llm_provider.from_value(settings.LLM_PROVIDER)
+    container.config.channel_type.from_value(settings.CHANNEL_TYPE)
+    container.wire(modules=["src.application.simple_agent"])
+    return container
 
 
 def print_error(message: str):
@@ -51,6 +75,9 @@ def print_success(message: str):
 def run_simple_agent(thread_id: str):
     """Lance l'agent simple avec gestion des erreurs."""
     try:
+        get_container()  # cable avant l'instanciation de l'agent (@inject)
+        from src.application.simple_agent import SimpleAgent
+
         agent = SimpleAgent()
 
         async def run():
@@ -71,7 +98,7 @@ def run_simple_agent(thread_id: str):
             finally:
                 await agent.cleanup()
 
-        asyncio.run(run())
+        run_async(run())
     except KeyboardInterrupt:
         print("\nArret demande par l'utilisateur.")
     except ImportError as e:
@@ -85,6 +112,9 @@ def run_simple_agent(thread_id: str):
 def run_rag_agent(thread_id: str):
     """Lance l'agent RAG avec gestion des erreurs."""
     try:
+        get_container()  # cable avant l'instanciation de l'agent (@inject)
+        from src.application.simple_agent import SimpleAgent
+
         agent = SimpleAgent(enable_rag=True)
 
         async def run():
@@ -106,7 +136,7 @@ def run_rag_agent(thread_id: str):
             finally:
                 await agent.cleanup()
 
-        asyncio.run(run())
+        run_async(run())
     except KeyboardInterrupt:
         print("\nArret demande par l'utilisateur.")
     except ImportError as e:
@@ -125,6 +155,9 @@ def run_serve_agent(enable_rag: bool = False):
     Le type de canal (redis/memory) est configuré via container.config.channel_type.
     """
     try:
+        from src.application.simple_agent import SimpleAgent
+        from src.config import settings
+
         agent = SimpleAgent(enable_rag=enable_rag)
         agent_type = "RAG" if enable_rag else "Simple"
 
@@ -138,7 +171,7 @@ def run_serve_agent(enable_rag: bool = False):
         print("(MessageChannel injecte via @inject)")
         print("Appuyez sur Ctrl+C pour arreter.\n")
 
-        asyncio.run(agent.serve())
+        run_async(agent.serve())
 
     except KeyboardInterrupt:
         print("\nArret demande par l'utilisateur.")
@@ -165,6 +198,9 @@ def run_index_documents(
         company_id: ID de l'entreprise pour le filtrage multi-tenant
     """
     try:
+        from src.config import settings
+
+        container = get_container()
         path = documents_path or settings.DOCUMENTS_PATH
         print(f"Indexation des documents depuis: {path}")
         print(f"Collection PGVector: {settings.PGVECTOR_COLLECTION_NAME}")
@@ -189,7 +225,7 @@ def run_index_documents(
             vector_store = container.vector_store()
             await vector_store.create_from_documents(chunks)
 
-        asyncio.run(index())
+        run_async(index())
 
         print_success(f"Indexation terminee: {len(chunks)} chunks dans '{settings.PGVECTOR_COLLECTION_NAME}'")
 
@@ -232,7 +268,7 @@ def run_add_company(company_id: str, name: str, tone: str):
             company = Company(company_id=company_id, name=name, tone=tone)
             await repo.create(company)
 
-        asyncio.run(add())
+        run_async(add())
         print_success(f"Entreprise '{name}' ({company_id}) ajoutee/mise a jour")
         print(f"  Ton: {tone}")
 
@@ -256,7 +292,7 @@ def run_list_companies():
             repo = CompanyRepository()
             return await repo.list_all()
 
-        companies = asyncio.run(list_all())
+        companies = run_async(list_all())
 
         if not companies:
             print("Aucune entreprise configuree.")
@@ -356,12 +392,14 @@ Exemples:
         run_rag_agent(thread_id)
 
     elif args.command == "serve":
+        container = get_container()
         # Reconfigurer le channel si override via CLI
         if args.channel_type:
             container.config.channel_type.from_value(args.channel_type)
         run_serve_agent(enable_rag=False)
 
     elif args.command == "serve-rag":
+        container = get_container()
         # Reconfigurer le channel si override via CLI
         if args.channel_type:
             container.config.channel_type.from_value(args.channel_type)
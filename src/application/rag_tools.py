@@ -65,7 +65,9 @@ def create_search_tool(rag_service: "RAGService"):
         rag_service: Instance de RAGService pour la recherche
 
     Returns:
-        Le tool search_documents configuré
+        Le tool search_documents configuré (coroutine: quand le LLM emet
+        plusieurs appels dans un meme tour, le ToolNode de LangGraph les
+        execute en parallele via asyncio.gather)
 
     Usage:
         rag_service = RAGService()
@@ -79,7 +81,7 @@ def create_search_tool(rag_service: "RAGService"):
     """
 
     @tool
-    def search_documents(
+    async def search_documents(
         query: str,
         runtime: ToolRuntime[None, RAGAgentState]
     ) -> str:
@@ -96,14 +98,19 @@ def create_search_tool(rag_service: "RAGService"):
         Returns:
             Les extraits de documents pertinents formatés
         """
-        # Récupère le company_id depuis l'état injecté via ToolRuntime
-        company_id = runtime.state.get("company_id")
+        # company_id de l'execution courante (config["configurable"]), sinon celui de l'état
+        company_id = (
+            runtime.config.get("configurable", {}).get("company_id")
+            or runtime.state.get("company_id")
+        )
 
         logger.info(f"search_documents: query='{query[:50]}...', company_id={company_id}")
 
         try:
-            result = rag_service.search_formatted(query, company_id=company_id)
-            logger.debug(f"Résultat: {len(result)} caractères")
+            result = await rag_service.asearch_formatted(query, company_id=company_id)
+            if result is None:
+                return "Aucun document pertinent trouve."
+            logger.debug("Résultat: %d caractères", len(result))
             return result
 
         except Exception as e:
@@ -93,7 +93,7 @@ class MessagingService:
         await self._channel.publish(outbox, {"chunk": chunk, "done": done})
 
         if done:
-            logger.debug(f"Réponse complète envoyée à {email}")
+            logger.debug("Réponse complète envoyée à %s", email)
 
     async def publish_error(self, email: str, error: str) -> None:
         """
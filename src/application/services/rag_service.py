@@ -65,7 +65,7 @@ class RAGService:
         Returns:
             Liste des documents pertinents
         """
-        logger.debug(f"RAGService.search: query='{query[:50]}...', company_id={company_id}")
+        logger.debug("RAGService.search: query='%.50s...', company_id=%s", query, company_id)
         return self._retriever.retrieve(query, k=k, company_id=company_id)
 
     def search_formatted(
@@ -87,6 +87,21 @@ class RAGService:
         """
         return self._retriever.retrieve_formatted(query, k=k, company_id=company_id)
 
+    async def asearch_formatted(
+        self,
+        query: str,
+        company_id: Optional[str] = None,
+        k: Optional[int] = None
+    ) -> Optional[str]:
+        """
+        Version asynchrone de search_formatted.
+
+        La recherche ne bloque pas la boucle d'evenements: plusieurs recherches
+        lancees en parallele se recouvrent (et partagent l'appel d'embedding
+        quand le retriever les regroupe).
+        """
+        return await self._retriever.aretrieve_formatted(query, k=k, company_id=company_id)
+
     def search_with_scores(
         self,
         query: str,
@@ -104,7 +119,7 @@ class RAGService:
         Returns:
             Liste de tuples (Document, score)
         """
-        logger.debug(f"RAGService.search_with_scores: query='{query[:50]}...'")
+        logger.debug("RAGService.search_with_scores: query='%.50s...'", query)
         return self._retriever.retrieve_with_scores(query, k=k, company_id=company_id)
 
     @property
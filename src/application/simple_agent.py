@@ -6,13 +6,18 @@ Supporte Ollama (local), Mistral (API) et OpenAI (API) via injection de dépenda
 
 import asyncio
 import logging
+import uuid
+from functools import lru_cache
 from typing import TYPE_CHECKING
 
 from pydantic import BaseModel, ConfigDict, ValidationError, Field
 
 import httpx
+from psycopg.rows import dict_row
+from psycopg_pool import AsyncConnectionPool
 from langgraph.prebuilt import create_react_agent
-from langchain_core.messages import HumanMessage
+from langchain_core.callbacks import AsyncCallbackHandler
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
 from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
 from dependency_injector.wiring import inject, Provide
 
@@ -20,6 +25,7 @@ from src.config import settings
 from src.infrastructure.container import Container
 from src.application.services.rag_service import RAGService
 from src.application.services.messaging_service import MessagingService
+from src.infrastructure.repositories.company_repository import CompanyRepository
 from src.domain.ports.llm_port import LLMPort
 
 if TYPE_CHECKING:
@@ -27,6 +33,15 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Fenetre de regroupement des tokens publies vers l'outbox (secondes / nombre de tokens)
+STREAM_FLUSH_INTERVAL = 0.016
+STREAM_FLUSH_MAX_CHUNKS = 50
+# Croissance de la taille des lots: 1, 3, 9, 27, 50 (premier token publie sans attente)
+STREAM_FLUSH_GROWTH = 3
+# Nouvelles tentatives si la connexion au LLM tombe avant le premier token
+STREAM_RETRY_ATTEMPTS = 3
+STREAM_RETRY_BASE_DELAY = 0.2
+
 
 class LLMProviderError(Exception):
     """Erreur liee au provider LLM."""
@@ -60,6 +75,40 @@ class _ParsedMessage(BaseModel):
     email: str = Field(min_length=1)
     user_message: str = Field(min_length=1, validation_alias="message")
 
+
+class _TokenSink(AsyncCallbackHandler):
+    """
+    Recoit les tokens du LLM (streaming=True) et les depose dans une file.
+
+    Seuls les tokens generes par le LLM y arrivent: les resultats des tools
+    ne sont jamais diffuses a l'utilisateur.
+    """
+
+    def __init__(self, queue: "asyncio.Queue[str | None]"):
+        self._queue = queue
+
+    async def on_llm_new_token(self, token: str, **kwargs) -> None:
+        if token:
+            self._queue.put_nowait(token)
+
+
+@lru_cache(maxsize=4096)
+def _thread_config(thread_id: str, company_id: str | None = None) -> dict:
+    """
+    Config LangGraph d'une conversation, construite une fois par (thread_id, company_id).
+
+    company_id voyage dans la config de l'execution (lue par le tool de recherche):
+    aucun etat partage entre les handlers concurrents. Lecture seule.
+    """
+    return {"configurable": {"thread_id": thread_id, "company_id": company_id}}
+
+
+@lru_cache(maxsize=1024)
+def _rag_prompt(company_name: str, tone: str) -> str:
+    """Prompt systeme RAG d'une entreprise, formate une fois par (nom, ton)."""
+    return settings.format_rag_prompt(company_name, tone)
+
+
 class SimpleAgent:
     """
     Agent conversationnel simple avec memoire PostgreSQL.
@@ -87,7 +136,7 @@ class SimpleAgent:
         self.llm = None
         self.llm_adapter = None  # LLMPort injecté
         self.agent = None
-        self.checkpointer_ctx = None
+        self._pg_pool: AsyncConnectionPool | None = None
         self.memory = None
         self._initialized = False
 
@@ -97,9 +146,15 @@ class SimpleAgent:
 
         # Cache d'agents par company_id (pour prompts personnalises)
         self._agents_cache: dict = {}
+        # Agents par prompt systeme: les entreprises au meme profil partagent un agent
+        self._agents_by_prompt: dict = {}
+        # Repository entreprise, cree a l'initialisation sur le pool du checkpointer
+        self._company_repo = None
+        # Chargements de contexte entreprise en cours (single-flight par company_id)
+        self._pending_companies: dict[str, asyncio.Task] = {}
 
     @inject
-    def _init_llm(self, llm_adapter: LLMPort = Provide[Container.llm]):
+    async def _init_llm(self, llm_adapter: LLMPort = Provide[Container.llm]):
         """
         Initialise le LLM via injection de dépendances.
 
@@ -115,14 +170,29 @@ class SimpleAgent:
         """
         self.llm_adapter = llm_adapter
         logger.info(f"Initialisation LLM via {llm_adapter.provider_name} adapter...")
-        self.llm = llm_adapter.get_llm()
+        # Verification de connexion asynchrone: ne bloque pas la boucle (mode serve)
+        self.llm = await llm_adapter.aget_llm()
         logger.info(f"LLM initialisé avec {llm_adapter.provider_name}")
 
     async def _setup_memory(self):
-        """Configure la memoire PostgreSQL."""
+        """
+        Configure la memoire PostgreSQL.
+
+        Le checkpointer emprunte ses connexions a un pool: les handlers
+        concurrents du mode serveur ne se serialisent plus sur une connexion unique.
+        """
         try:
-            self.checkpointer_ctx = AsyncPostgresSaver.from_conn_string(settings.get_postgres_uri())
-            self.memory = await self.checkpointer_ctx.__aenter__()
+            self._pg_pool = AsyncConnectionPool(
+                conninfo=settings.get_postgres_uri(),
+                min_size=settings.CHECKPOINT_POOL_MIN,
+                max_size=settings.CHECKPOINT_POOL_MAX,
+                max_idle=300,
+                open=False,
+                # Options requises par AsyncPostgresSaver
+                kwargs={"autocommit": True, "prepare_threshold": 0, "row_factory": dict_row},
+            )
+            await self._pg_pool.open(wait=True)
+            self.memory = AsyncPostgresSaver(self._pg_pool)
             await self.memory.setup()
         except Exception as e:
             raise DatabaseConnectionError(
@@ -131,6 +201,18 @@ class SimpleAgent:
                 "Lancez: python main.py setup-db pour plus de details."
             )
 
+    async def check_database(self) -> bool:
+        """Verifie qu'une connexion du pool repond (SELECT 1)."""
+        if self._pg_pool is None:
+            return False
+        try:
+            async with self._pg_pool.connection() as conn:
+                await conn.execute("SELECT 1")
+            return True
+        except Exception as e:
+            logger.warning(f"Health check PostgreSQL en echec: {e}")
+            return False
+
     @inject
     def _setup_rag(
         self,
@@ -167,6 +249,8 @@ class SimpleAgent:
         avec le prompt personnalise si necessaire.
 
         Optimisation: Query DB uniquement si l'agent n'est pas deja en cache.
+        Single-flight: les messages concurrents d'une meme entreprise attendent
+        le chargement deja en cours (une seule query DB et un seul agent cree).
 
         Args:
             company_id: ID de l'entreprise
@@ -175,11 +259,17 @@ class SimpleAgent:
         if company_id in self._agents_cache:
             return
 
-        # Sinon, recuperer les infos entreprise et creer l'agent
-        from src.infrastructure.repositories.company_repository import CompanyRepository
+        pending = self._pending_companies.get(company_id)
+        if pending is None:
+            pending = asyncio.create_task(self._load_company_context(company_id))
+            self._pending_companies[company_id] = pending
+            pending.add_done_callback(lambda _: self._pending_companies.pop(company_id, None))
+        # shield: l'annulation d'un appelant n'interrompt pas le chargement partage
+        await asyncio.shield(pending)
 
-        repo = CompanyRepository()
-        company = await repo.get_by_id(company_id)
+    async def _load_company_context(self, company_id: str) -> None:
+        """Recupere les infos entreprise et cree l'agent personnalise."""
+        company = await self._company_repo.get_by_id(company_id)
 
         if company:
             logger.info(f"Creation agent personnalise pour {company.name} ({company_id})")
@@ -202,15 +292,18 @@ class SimpleAgent:
             tools = [self.search_tool] if self.search_tool else []
 
             # Prompt statique personnalise pour l'entreprise
-            system_prompt = settings.format_rag_prompt(company_name, tone)
-
-            agent = create_react_agent(
-                model=self.llm,
-                tools=tools,
-                prompt=system_prompt,
-                state_schema=RAGAgentState,
-                checkpointer=self.memory
-            )
+            system_prompt = _rag_prompt(company_name, tone)
+
+            agent = self._agents_by_prompt.get(system_prompt)
+            if agent is None:
+                agent = create_react_agent(
+                    model=self.llm,
+                    tools=tools,
+                    prompt=system_prompt,
+                    state_schema=RAGAgentState,
+                    checkpointer=self.memory
+                )
+                self._agents_by_prompt[system_prompt] = agent
 
             self._agents_cache[company_id] = agent
             logger.info(f"Agent personnalise cree pour {company_name}")
@@ -292,19 +385,33 @@ class SimpleAgent:
         if self._initialized:
             return
 
-        self._init_llm()
-        await self._setup_memory()
+        # LLM (verification HTTP) et memoire (pool PostgreSQL) sont independants:
+        # initialises en parallele, l'erreur du LLM reste prioritaire
+        results = await asyncio.gather(
+            self._init_llm(), self._setup_memory(), return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                await self.cleanup()
+                raise result
+        # Requetes entreprise sur le pool du checkpointer (pas de connexion par appel)
+        self._company_repo = CompanyRepository(self._pg_pool)
         self._setup_rag()  # Configure RAG si enable_rag=True
         self._create_agent()
         self._initialized = True
 
         mode = "RAG" if self.enable_rag else "Simple"
-        logger.info(f"Agent initialise en mode {mode}")
+        loop_module = type(asyncio.get_running_loop()).__module__
+        logger.info(f"Agent initialise en mode {mode} (boucle: {loop_module})")
 
-    def _enrich_with_rag(self, user_input: str, company_id: str = None) -> str | None:
+    async def _enrich_with_rag(self, user_input: str, company_id: str = None) -> str | None:
         """
         Enrichit le message avec le contexte RAG si active.
 
+        Recherche asynchrone: ne bloque pas la boucle pendant l'embedding et la
+        requete pgvector, et l'embedding est regroupe avec les recherches
+        concurrentes des autres handlers.
+
         Returns:
             Le message enrichi, le message original (si RAG desactive),
             ou None si aucun document trouve.
@@ -312,19 +419,27 @@ class SimpleAgent:
         if not self.enable_rag or not self.rag_service:
             return user_input
 
-        logger.debug(f"RAG: Recherche pour: {user_input[:50]}...")
-        rag_context = self.rag_service.search_formatted(user_input, company_id=company_id)
+        logger.debug("RAG: Recherche pour: %.50s...", user_input)
+        rag_context = await self.rag_service.asearch_formatted(user_input, company_id=company_id)
 
         if rag_context is None:
             logger.info(f"RAG: Aucun document pour company_id={company_id}")
             return None
 
-        logger.debug(f"RAG: {len(rag_context)} chars de contexte")
+        logger.debug("RAG: %d chars de contexte", len(rag_context))
         return f"CONTEXTE DOCUMENTAIRE:\n{rag_context}\n\n---\nQUESTION: {user_input}"
 
     def _build_input_state(self, message: str, company_id: str = None) -> dict:
-        """Construit le state d'entree pour l'agent."""
-        state = {"messages": [HumanMessage(content=message)]}
+        """
+        Construit le state d'entree pour l'agent.
+
+        model_construct: le contenu est deja une str validee, la validation
+        Pydantic du message est inutile. L'id fixe rend une nouvelle tentative
+        idempotente (add_messages remplace le message de meme id).
+        """
+        state = {"messages": [
+            HumanMessage.model_construct(content=message, type="human", id=str(uuid.uuid4()))
+        ]}
         if company_id:
             state["company_id"] = company_id
         return state
@@ -333,6 +448,13 @@ class SimpleAgent:
         """
         Stream la reponse de l'agent avec gestion d'erreurs.
 
+        Une coupure de connexion au LLM avant le premier token (ex: Ollama qui
+        change de modele) est retentee STREAM_RETRY_ATTEMPTS fois avec un delai
+        exponentiel; apres le premier token, l'erreur remonte (pas de doublon).
+
+        Sans RAG (aucun tool), le LLM est appele directement (_stream_direct)
+        au lieu d'executer le graphe.
+
         Yields:
             str: Tokens de la reponse
         """
@@ -340,11 +462,23 @@ class SimpleAgent:
         current_agent = self._get_current_agent(company_id)
 
         try:
-            async for chunk, _ in current_agent.astream(
-                input_state, config=config, stream_mode="messages"
-            ):
-                if chunk.content:
-                    yield chunk.content
+            for attempt in range(STREAM_RETRY_ATTEMPTS):
+                emitted = False
+                try:
+                    if self.enable_rag:
+                        tokens = self._stream_once(current_agent, input_state, config)
+                    else:
+                        tokens = self._stream_direct(input_state, config)
+                    async for token in tokens:
+                        emitted = True
+                        yield token
+                    return
+                except (httpx.ConnectError, httpx.ReadError) as e:
+                    if emitted or attempt == STREAM_RETRY_ATTEMPTS - 1:
+                        raise
+                    delay = STREAM_RETRY_BASE_DELAY * 2 ** attempt
+                    logger.warning(f"Connexion LLM interrompue ({e}), nouvel essai dans {delay:.1f}s")
+                    await asyncio.sleep(delay)
         except httpx.ConnectError:
             if provider_name == "ollama":
                 raise OllamaConnectionError(
@@ -358,6 +492,58 @@ class SimpleAgent:
         except Exception as e:
             raise AgentError(f"Erreur lors de la generation de la reponse: {e}")
 
+    async def _stream_direct(self, input_state: dict, config: dict):
+        """
+        Mode simple (sans RAG ni tools): stream direct du LLM, hors graphe.
+
+        Un agent sans tool ne fait qu'un appel LLM: l'historique est lu dans le
+        checkpoint, puis la reponse est ecrite en une seule mise a jour (au lieu
+        des checkpoints de chaque etape du graphe). Le format est celui du noeud
+        "agent": la conversation reste lisible par le graphe.
+        """
+        snapshot = await self.agent.aget_state(config)
+        human = input_state["messages"][0]
+        messages = [
+            SystemMessage(content=settings.SYSTEM_PROMPT),
+            *snapshot.values.get("messages", []),
+            human,
+        ]
+
+        parts: list[str] = []
+        async for chunk in self.llm.astream(messages):
+            if chunk.content:
+                parts.append(chunk.content)
+                yield chunk.content
+
+        await self.agent.aupdate_state(
+            config,
+            {"messages": [human, AIMessage(content="".join(parts))]},
+            as_node="agent",
+        )
+
+    async def _stream_once(self, agent, input_state: dict, config: dict):
+        """
+        Une execution de l'agent: tokens recus via _TokenSink.
+
+        L'agent s'execute via ainvoke dans une tache; les tokens arrivent par le
+        callback on_llm_new_token dans une file lue ici, sans generateur
+        intermediaire astream ni filtrage par message.
+        """
+        queue: asyncio.Queue[str | None] = asyncio.Queue()
+        run = asyncio.create_task(agent.ainvoke(
+            input_state, config={**config, "callbacks": [_TokenSink(queue)]}
+        ))
+        # Sentinelle: fin du flux a la fin de l'execution (succes ou erreur)
+        run.add_done_callback(lambda _: queue.put_nowait(None))
+
+        try:
+            while (token := await queue.get()) is not None:
+                yield token
+            await run
+        finally:
+            # Consommateur parti avant la fin (generateur ferme): stoppe l'agent
+            run.cancel()
+
     async def chat(self, user_input: str, thread_id: str = "conversation-1", company_id: str = None):
         """
         Envoie un message et stream la reponse.
@@ -376,16 +562,16 @@ class SimpleAgent:
         if not self._initialized:
             raise AgentError("L'agent n'est pas initialise. Appelez initialize() d'abord.")
 
-        message = self._enrich_with_rag(user_input, company_id)
+        message = await self._enrich_with_rag(user_input, company_id)
         if message is None:
-            logger.debug(f"PAS DE CHUNK TROUVER POUR {user_input[:50]}... (company_id={company_id})")
+            logger.debug("PAS DE CHUNK TROUVER POUR %.50s... (company_id=%s)", user_input, company_id)
             yield "Je n'ai pas cette information dans notre documentation."
             return
 
         input_state = self._build_input_state(message, company_id)
-        config = {"configurable": {"thread_id": thread_id}}
+        config = _thread_config(thread_id, company_id)
 
-        logger.debug(f"chat({user_input[:50]}...) -> thread={thread_id}, company={company_id}")
+        logger.debug("chat(%.50s...) -> thread=%s, company=%s", user_input, thread_id, company_id)
 
         async for chunk in self._stream_response(input_state, config, company_id):
             yield chunk
@@ -412,12 +598,27 @@ class SimpleAgent:
             logger.info("Auto-initialisation...")
             await self.initialize()
 
-        async with messaging:
+        # Admission bornee: au plus MAX_INFLIGHT_MESSAGES handlers en cours. Au-dela,
+        # la lecture du canal attend une place (pas de fan-out illimite de taches
+        # qui epuiserait le pool PostgreSQL du checkpointer).
+        inflight = asyncio.Semaphore(settings.MAX_INFLIGHT_MESSAGES)
+
+        async def _run(msg: "Message") -> None:
+            try:
+                await self._handle_message(messaging, msg)
+            except Exception as e:
+                # Ne doit pas annuler les autres handlers du TaskGroup
+                logger.error(f"Echec du traitement d'un message: {e}", exc_info=True)
+            finally:
+                inflight.release()
+
+        # TaskGroup: les handlers en cours sont attendus (ou annules) avant la
+        # deconnexion du canal, aucune tache n'est orpheline a l'arret
+        async with messaging, asyncio.TaskGroup() as tg:
             logger.info("Agent en écoute...")
             async for msg in messaging.listen():
-                asyncio.create_task(
-                    self._handle_message(messaging, msg)
-                )
+                await inflight.acquire()
+                tg.create_task(_run(msg))
 
     async def _ensure_company_context(self, company_id: str | None) -> None:
         """
@@ -435,19 +636,69 @@ class SimpleAgent:
         """
         Execute le chat en streaming et publie les chunks vers l'utilisateur.
 
+        Les tokens passent par une file videe par une tache d'ecriture unique
+        (_flush_loop): la generation n'attend pas Redis et plusieurs tokens
+        partent en un seul PUBLISH.
+
         Args:
             messaging: Service de messaging pour publier la reponse
             parsed: Message parse et valide
         """
-        async for chunk in self.chat(
-            parsed.user_message,
-            thread_id=parsed.email,
-            company_id=parsed.company_id,
-        ):
-            await messaging.publish_chunk(parsed.email, chunk)
+        queue: asyncio.Queue[str | None] = asyncio.Queue()
+        writer = asyncio.create_task(self._flush_loop(messaging, parsed.email, queue))
+        try:
+            async for chunk in self.chat(
+                parsed.user_message,
+                thread_id=parsed.email,
+                company_id=parsed.company_id,
+            ):
+                queue.put_nowait(chunk)
+        finally:
+            # Sentinelle: la tache d'ecriture publie le reste puis se termine
+            queue.put_nowait(None)
+            await writer
 
         await messaging.publish_chunk(parsed.email, "", done=True)
 
+    async def _flush_loop(
+        self, messaging: MessagingService, email: str, queue: "asyncio.Queue[str | None]"
+    ) -> None:
+        """
+        Publie les tokens de la file par lots (taille du lot ou STREAM_FLUSH_INTERVAL
+        secondes apres le premier token), concatenes dans un seul chunk: le format
+        {"chunk", "done"} attendu par les clients est inchange.
+
+        La taille du lot croit de STREAM_FLUSH_GROWTH a chaque publication jusqu'a
+        STREAM_FLUSH_MAX_CHUNKS: le premier token part seul (TTFT inchange), la
+        suite du flux est regroupee de plus en plus.
+        """
+        loop = asyncio.get_running_loop()
+        batch_size = 1
+        done = False
+        while not done:
+            chunk = await queue.get()
+            if chunk is None:
+                return
+            buffer = [chunk]
+            deadline = loop.time() + STREAM_FLUSH_INTERVAL
+            while len(buffer) < batch_size:
+                try:
+                    chunk = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        chunk = await asyncio.wait_for(queue.get(), remaining)
+                    except TimeoutError:
+                        break
+                if chunk is None:
+                    done = True
+                    break
+                buffer.append(chunk)
+            await messaging.publish_chunk(email, "".join(buffer))
+            batch_size = min(batch_size * STREAM_FLUSH_GROWTH, STREAM_FLUSH_MAX_CHUNKS)
+
     async def _handle_message(self, messaging: MessagingService, msg: "Message"):
         """
         Traite un message et publie la reponse.
@@ -485,9 +736,17 @@ class SimpleAgent:
             await messaging.publish_error(parsed.email, "Une erreur inattendue est survenue.")
 
     async def cleanup(self):
-        """Nettoie les ressources."""
+        """
+        Nettoie les ressources.
+
+        Les fermetures sont lancees en parallele: l'arret ne s'allonge pas a
+        chaque ressource ajoutee. Les ressources partagees (client HTTP Ollama,
+        vector store du conteneur) ne sont pas fermees ici.
+        """
+        closers = []
+        if self._pg_pool:
+            closers.append(self._pg_pool.close())
         try:
-            if self.checkpointer_ctx:
-                await self.checkpointer_ctx.__aexit__(None, None, None)
+            await asyncio.gather(*closers, return_exceptions=True)
         except Exception:
             pass  # Ignorer les erreurs de nettoyage
@@ -6,6 +6,8 @@ une interface unique pour acceder a la configuration.
 """
 
 import os
+from functools import lru_cache
+
 from dotenv import load_dotenv
 
 # Charger les variables d'environnement depuis .env
@@ -31,6 +33,8 @@ class Settings:
     OLLAMA_MODEL: str = os.getenv("OLLAMA_MODEL", "phi3:mini")
     OLLAMA_BASE_URL: str = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
     OLLAMA_EMBEDDING_MODEL: str = os.getenv("OLLAMA_EMBEDDING_MODEL", "nomic-embed-text")
+    # Duree de maintien du modele en memoire: garde le KV-cache du prefixe (prompt systeme) entre les tours
+    OLLAMA_KEEP_ALIVE: str = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
 
     # === CONFIGURATION MISTRAL ===
     MISTRAL_API_KEY: str = os.getenv("MISTRAL_API_KEY", "")
@@ -51,6 +55,10 @@ class Settings:
     POSTGRES_DB: str = os.getenv("POSTGRES_DB", "agent_memory")
     POSTGRES_USER: str = os.getenv("POSTGRES_USER", "postgres")
     POSTGRES_PASSWORD: str = os.getenv("POSTGRES_PASSWORD", "postgres")
+    DB_POOL_MIN: int = int(os.getenv("DB_POOL_MIN", "4"))
+    DB_POOL_MAX: int = int(os.getenv("DB_POOL_MAX", "20"))
+    # Requetes preparees des la 1ere execution ("" pour desactiver, ex: PgBouncer en mode transaction)
+    DB_PREPARE_THRESHOLD: str = os.getenv("DB_PREPARE_THRESHOLD", "0")
 
     # === PROMPTS SYSTEME ===
     DEFAULT_SYSTEM_PROMPT: str = (
@@ -117,8 +125,33 @@ CE QUI SUIT APRES NE DOIT PAS ETRE INCLUS DANS LE PROMPT SYSTEME MAIS DANS CHAQU
     DOCUMENTS_PATH: str = os.getenv("DOCUMENTS_PATH", "./documents")
     CHUNK_SIZE: int = int(os.getenv("CHUNK_SIZE", "1000"))
     CHUNK_OVERLAP: int = int(os.getenv("CHUNK_OVERLAP", "200"))
+    # Chunks plus courts fusionnes avec leur voisin (dans la limite de CHUNK_SIZE)
+    MIN_CHUNK_SIZE: int = int(os.getenv("MIN_CHUNK_SIZE", "200"))
+    # Nombre de batches d'embeddings en vol simultanement (worker de vectorisation)
+    EMBED_CONCURRENCY: int = int(os.getenv("EMBED_CONCURRENCY", "4"))
+    # Connexions du moteur SQLAlchemy de PGVector par processus (recherche, sans overflow)
+    PGVECTOR_POOL_SIZE: int = int(os.getenv("PGVECTOR_POOL_SIZE", "5"))
+    # Budget de tokens (approx. 4 caracteres/token) par requete d'embedding
+    EMBED_BATCH_TOKENS: int = int(os.getenv("EMBED_BATCH_TOKENS", "8000"))
+    # Processus dedies au parsing/decoupage PDF dans le worker (CPU)
+    PDF_WORKERS: int = int(os.getenv("PDF_WORKERS", str(os.cpu_count() or 2)))
+    # Extraction de texte PDF: "pymupdf" (MuPDF, natif) ou "pypdf" (pur Python)
+    PDF_BACKEND: str = os.getenv("PDF_BACKEND", "pymupdf")
+    # Repertoire des PDF temporaires du worker (ex: /dev/shm pour eviter le disque)
+    PDF_TMP_DIR: str | None = os.getenv("PDF_TMP_DIR") or None
     RETRIEVER_K: int = int(os.getenv("RETRIEVER_K", "3"))
+    # Taille de la liste de candidats HNSW a la recherche (pgvector, defaut serveur: 40)
+    HNSW_EF_SEARCH: int = int(os.getenv("HNSW_EF_SEARCH", "100"))
+    # Construction de l'index HNSW (setup-db): connexions par noeud, candidats a la construction
+    HNSW_M: int = int(os.getenv("HNSW_M", "24"))
+    HNSW_EF_CONSTRUCTION: int = int(os.getenv("HNSW_EF_CONSTRUCTION", "128"))
+    HNSW_MAINTENANCE_WORK_MEM: str = os.getenv("HNSW_MAINTENANCE_WORK_MEM", "2GB")
+    HNSW_BUILD_PARALLEL_WORKERS: int = int(os.getenv("HNSW_BUILD_PARALLEL_WORKERS", "7"))
     PGVECTOR_COLLECTION_NAME: str = os.getenv("PGVECTOR_COLLECTION_NAME", "documents")
+    # Type SQL des embeddings: "halfvec" (FP16, moitie moins d'octets) ou "vector" (FP32)
+    EMBEDDING_SQL_TYPE: str = os.getenv("EMBEDDING_SQL_TYPE", "halfvec")
+    # Dimension des embeddings du modele (obligatoire pour le stockage pgvector)
+    EMBEDDING_DIMENSIONS: int = int(os.getenv("EMBEDDING_DIMENSIONS", "0"))
 
     # === CONFIGURATION GOOGLE CLOUD STORAGE ===
     GCS_BUCKET_NAME: str = os.getenv("GCS_BUCKET_NAME", "")
@@ -126,22 +159,61 @@ CE QUI SUIT APRES NE DOIT PAS ETRE INCLUS DANS LE PROMPT SYSTEME MAIS DANS CHAQU
     GCS_SERVICE_ACCOUNT_KEY: str = os.getenv("GCS_SERVICE_ACCOUNT_KEY", "")
     MAX_UPLOAD_SIZE_BYTES: int = int(os.getenv("MAX_UPLOAD_SIZE_BYTES", str(10 * 1024 * 1024)))
     MAX_PAGES_PER_COMPANY: int = int(os.getenv("MAX_PAGES_PER_COMPANY", "5"))
+    # Upload multipart parallele (XML API) au-dela de ce seuil
+    GCS_PARALLEL_UPLOAD_THRESHOLD_BYTES: int = int(os.getenv("GCS_PARALLEL_UPLOAD_THRESHOLD_BYTES", str(8 * 1024 * 1024)))
+    GCS_UPLOAD_CHUNK_SIZE_BYTES: int = int(os.getenv("GCS_UPLOAD_CHUNK_SIZE_BYTES", str(8 * 1024 * 1024)))
+    GCS_UPLOAD_WORKERS: int = int(os.getenv("GCS_UPLOAD_WORKERS", "8"))
 
     # === CONFIGURATION MESSAGING ===
     CHANNEL_TYPE: str = os.getenv("CHANNEL_TYPE", "redis")  # "redis" ou "memory"
     REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379")
+    # Messages traites simultanement par l'agent en mode serve (<= CHECKPOINT_POOL_MAX)
+    # Par defaut aligne sur OLLAMA_NUM_PARALLEL (capacite du serveur LLM) si defini
+    MAX_INFLIGHT_MESSAGES: int = int(
+        os.getenv("MAX_INFLIGHT_MESSAGES", os.getenv("OLLAMA_NUM_PARALLEL", "32"))
+    )
+    # Pool de connexions du checkpointer LangGraph (agent): une connexion par
+    # message en vol suffit, chaque handler n'en emprunte qu'une a la fois
+    CHECKPOINT_POOL_MAX: int = int(os.getenv("CHECKPOINT_POOL_MAX", str(MAX_INFLIGHT_MESSAGES)))
+    CHECKPOINT_POOL_MIN: int = int(
+        os.getenv("CHECKPOINT_POOL_MIN", str(min(4, CHECKPOINT_POOL_MAX)))
+    )
+    # Nombre max de connexions du pool Redis pub/sub (event broker backend)
+    REDIS_POOL_SIZE: int = int(os.getenv("REDIS_POOL_SIZE", "64"))
+    # Intervalle de polling de la file ARQ par le worker (secondes)
+    ARQ_POLL_DELAY: float = float(os.getenv("ARQ_POLL_DELAY", "0.1"))
+    # Nombre max de connexions du pool Redis ARQ (cote API)
+    ARQ_POOL_SIZE: int = int(os.getenv("ARQ_POOL_SIZE", "10"))
 
     # === CONFIGURATION JWT ===
     # Generate SECRET_KEY with: openssl rand -hex 32
     JWT_SECRET_KEY: str = os.getenv("JWT_SECRET_KEY", "09d25e094faa6ca2556c818166b7a9563b93f7099f6f0f4caa6cf63b88e8d3e7")
     JWT_ALGORITHM: str = os.getenv("JWT_ALGORITHM", "HS256")
     JWT_ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("JWT_ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
+    # Cache des tokens deja verifies (decode_token)
+    TOKEN_CACHE_TTL_SECONDS: int = int(os.getenv("TOKEN_CACHE_TTL_SECONDS", "60"))
+    TOKEN_CACHE_MAXSIZE: int = int(os.getenv("TOKEN_CACHE_MAXSIZE", "10000"))
+
+    # === CONFIGURATION BCRYPT ===
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    # Si active, le cout est calibre au demarrage pour rester sous BCRYPT_MAX_MS par hash
+    BCRYPT_AUTO_CALIBRATE: bool = os.getenv("BCRYPT_AUTO_CALIBRATE", "false").lower() == "true"
+    BCRYPT_MAX_MS: float = float(os.getenv("BCRYPT_MAX_MS", "250"))
+
+    # === CACHE DES REPOSITORIES (backend) ===
+    REPO_CACHE_TTL_SECONDS: int = int(os.getenv("REPO_CACHE_TTL_SECONDS", "60"))
+    REPO_CACHE_MAXSIZE: int = int(os.getenv("REPO_CACHE_MAXSIZE", "10000"))
+    USER_EMAIL_BLOOM_CAPACITY: int = int(os.getenv("USER_EMAIL_BLOOM_CAPACITY", "100000"))
 
     @classmethod
+    @lru_cache(maxsize=1)
     def get_postgres_uri(cls) -> str:
         """
         Construit l'URI de connexion PostgreSQL.
         Priorite a DATABASE_URL si definie.
+
+        Resolue une seule fois par processus: la configuration n'est pas
+        modifiee apres le demarrage.
         """
         return os.getenv(
             "DATABASE_URL",
@@ -5,6 +5,7 @@ Ce port définit le contrat que tout adapter LLM doit implémenter
 (Ollama, Mistral, OpenAI, etc.).
 """
 
+import asyncio
 from abc import ABC, abstractmethod
 
 from langchain_core.language_models.chat_models import BaseChatModel
@@ -35,6 +36,15 @@ class LLMPort(ABC):
         """
         pass
 
+    async def aget_llm(self) -> BaseChatModel:
+        """
+        Version asynchrone de get_llm (verification de connexion non bloquante).
+
+        Par defaut, get_llm s'execute dans un thread; les adapters peuvent
+        surcharger avec une verification nativement asynchrone.
+        """
+        return await asyncio.to_thread(self.get_llm)
+
     @abstractmethod
     def check_connection(self) -> bool:
         """
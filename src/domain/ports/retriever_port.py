@@ -5,6 +5,7 @@ Ce port définit le contrat pour les retrievers qui orchestrent
 la recherche et le formatage des documents.
 """
 
+import asyncio
 from abc import ABC, abstractmethod
 from typing import List, Optional, Tuple, Any
 
@@ -61,6 +62,22 @@ class RetrieverPort(ABC):
         """
         pass
 
+    async def aretrieve_formatted(
+        self,
+        query: str,
+        k: Optional[int] = None,
+        company_id: Optional[str] = None
+    ) -> str:
+        """
+        Version asynchrone de retrieve_formatted.
+
+        Par defaut, retrieve_formatted s'execute dans un thread; les
+        implementations peuvent surcharger (ex: embeddings de requetes groupes).
+        """
+        return await asyncio.to_thread(
+            self.retrieve_formatted, query, k=k, company_id=company_id
+        )
+
     @abstractmethod
     def retrieve_with_scores(
         self,
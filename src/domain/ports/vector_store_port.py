@@ -70,6 +70,20 @@ class VectorStorePort(ABC):
         """
         pass
 
+    @abstractmethod
+    async def filter_existing_hashes(self, document_id: str, hashes: List[str]) -> set[str]:
+        """
+        Retourne les empreintes de contenu deja indexees pour un document.
+
+        Args:
+            document_id: ID du document
+            hashes: Empreintes (metadata content_hash) a verifier
+
+        Returns:
+            Sous-ensemble de hashes deja present dans le vector store
+        """
+        pass
+
     @abstractmethod
     async def delete_by_document_id(self, document_id: str) -> int:
         """
@@ -5,6 +5,8 @@ Permet d'utiliser Ollama comme LLM provider via l'architecture hexagonale.
 """
 
 import logging
+import time
+from typing import ClassVar, NoReturn, Optional
 
 import httpx
 from langchain_core.language_models.chat_models import BaseChatModel
@@ -14,6 +16,13 @@ from src.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Duree de validite d'une verification de connexion reussie
+_CONNECTION_CHECK_TTL = 30.0
+# Timeout de la sonde /api/tags (secondes)
+_CONNECTION_CHECK_TIMEOUT = 2.0
+# Instant monotonic de la derniere verification reussie
+_last_connection_ok: Optional[float] = None
+
 
 class OllamaAdapter(LLMPort):
     """
@@ -23,8 +32,12 @@ class OllamaAdapter(LLMPort):
         - OLLAMA_BASE_URL: URL du serveur Ollama
         - OLLAMA_MODEL: Modèle à utiliser (ex: phi3:mini)
         - MODEL_TEMPERATURE: Température du modèle
+        - OLLAMA_KEEP_ALIVE: Duree de maintien du modele en memoire
     """
 
+    # Client HTTP partage (keep-alive), cree au premier usage
+    _http_client: ClassVar[Optional[httpx.AsyncClient]] = None
+
     def __init__(self):
         self._llm = None
 
@@ -50,6 +63,39 @@ class OllamaAdapter(LLMPort):
             logger.warning(f"Ollama non accessible: {e}")
             return False
 
+    @classmethod
+    def _get_http_client(cls) -> httpx.AsyncClient:
+        if cls._http_client is None:
+            cls._http_client = httpx.AsyncClient(
+                base_url=settings.OLLAMA_BASE_URL, timeout=_CONNECTION_CHECK_TIMEOUT
+            )
+        return cls._http_client
+
+    async def acheck_connection(self) -> bool:
+        """
+        Version asynchrone de check_connection. Un succes est memorise
+        _CONNECTION_CHECK_TTL secondes; un echec n'est pas memorise, pour
+        qu'un Ollama qui vient de redemarrer soit detecte immediatement.
+
+        Returns:
+            True si Ollama répond, False sinon
+        """
+        global _last_connection_ok
+        now = time.monotonic()
+        if _last_connection_ok is not None and now - _last_connection_ok < _CONNECTION_CHECK_TTL:
+            return True
+
+        try:
+            response = await self._get_http_client().get("/api/tags")
+        except httpx.RequestError as e:
+            logger.warning(f"Ollama non accessible: {e}")
+            return False
+
+        if response.status_code != 200:
+            return False
+        _last_connection_ok = now
+        return True
+
     def get_llm(self) -> BaseChatModel:
         """
         Retourne l'instance ChatOllama configurée.
@@ -61,24 +107,52 @@ class OllamaAdapter(LLMPort):
             ConnectionError: Si Ollama n'est pas accessible
         """
         if self._llm is None:
-            from langchain_ollama import ChatOllama
-
             if not self.check_connection():
-                raise ConnectionError(
-                    f"Ollama non disponible à {settings.OLLAMA_BASE_URL}. "
-                    "Vérifiez que le serveur est démarré."
-                )
-
-            logger.info(
-                f"Initialisation ChatOllama: model={settings.OLLAMA_MODEL}, "
-                f"url={settings.OLLAMA_BASE_URL}"
-            )
+                self._raise_unavailable()
+            self._llm = self._create_llm()
+        return self._llm
 
-            self._llm = ChatOllama(
-                model=settings.OLLAMA_MODEL,
-                base_url=settings.OLLAMA_BASE_URL,
-                temperature=settings.MODEL_TEMPERATURE,
-                streaming=True
-            )
+    async def aget_llm(self) -> BaseChatModel:
+        """
+        Version asynchrone de get_llm: la verification de connexion ne bloque
+        pas la boucle d'evenements.
 
+        Raises:
+            ConnectionError: Si Ollama n'est pas accessible
+        """
+        if self._llm is None:
+            if not await self.acheck_connection():
+                self._raise_unavailable()
+            self._llm = self._create_llm()
         return self._llm
+
+    def _raise_unavailable(self) -> NoReturn:
+        raise ConnectionError(
+            f"Ollama non disponible à {settings.OLLAMA_BASE_URL}. "
+            "Vérifiez que le serveur est démarré."
+        )
+
+    def _create_llm(self) -> BaseChatModel:
+        from langchain_ollama import ChatOllama
+
+        logger.info(
+            f"Initialisation ChatOllama: model={settings.OLLAMA_MODEL}, "
+            f"url={settings.OLLAMA_BASE_URL}"
+        )
+
+        return ChatOllama(
+            model=settings.OLLAMA_MODEL,
+            base_url=settings.OLLAMA_BASE_URL,
+            temperature=settings.MODEL_TEMPERATURE,
+            streaming=True,
+            # Modele garde charge entre les tours: Ollama reutilise le KV-cache
+            # du prefixe commun (prompt systeme + historique) au lieu de le
+            # re-evaluer a chaque message
+            keep_alive=settings.OLLAMA_KEEP_ALIVE,
+            # Options du client HTTP (httpx) cree une fois par ChatOllama et
+            # partage par tous les streams: connexions keep-alive reutilisees
+            client_kwargs={
+                "timeout": httpx.Timeout(30.0, connect=5.0),
+                "limits": httpx.Limits(max_keepalive_connections=20, max_connections=50),
+            },
+        )
@@ -7,18 +7,77 @@ Le provider d'embedding est configurable via EMBEDDING_PROVIDER (ollama, mistral
 
 import asyncio
 import logging
+import uuid
 from typing import List, Optional, Tuple, Any
 
 from langchain_core.documents import Document
 from langchain_postgres import PGVector
 from langchain_postgres.vectorstores import PGVector as PGVectorStore
+from psycopg_pool import AsyncConnectionPool
 
 from src.config.settings import settings
+from src.infrastructure.db_setup import ensure_embedding_schema
 from src.domain.ports.vector_store_port import VectorStorePort
 from src.domain.ports.retriever_port import RetrieverPort
 
 logger = logging.getLogger(__name__)
 
+# Taille des batches d'indexation initiale (create_from_documents)
+INDEX_BATCH_SIZE = 64
+# Regroupement des embeddings de requetes: taille max d'un lot / fenetre d'attente (s)
+QUERY_BATCH_MAX = 16
+QUERY_BATCH_WINDOW = 0.005
+
+
+class _QueryEmbeddingBatcher:
+    """
+    Regroupe les embeddings de requetes arrivant dans une courte fenetre.
+
+    Chaque embed() met sa requete en attente; le lot part en un seul appel
+    aembed_documents apres QUERY_BATCH_WINDOW secondes ou des QUERY_BATCH_MAX
+    requetes, puis chaque appelant recoit son vecteur. Les recherches lancees
+    en parallele (tool calls d'un meme tour, handlers concurrents) partagent
+    ainsi un aller-retour vers le modele d'embedding.
+    """
+
+    def __init__(self, embeddings):
+        self._embeddings = embeddings
+        self._pending: list[tuple[str, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def embed(self, text: str) -> List[float]:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((text, future))
+        if len(self._pending) >= QUERY_BATCH_MAX:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(QUERY_BATCH_WINDOW, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.create_task(self._embed_batch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _embed_batch(self, batch: list[tuple[str, asyncio.Future]]) -> None:
+        try:
+            vectors = await self._embeddings.aembed_documents([text for text, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), vector in zip(batch, vectors):
+            if not future.done():
+                future.set_result(vector)
+
 
 class PGVectorAdapter(VectorStorePort, RetrieverPort):
     """
@@ -35,12 +94,18 @@ class PGVectorAdapter(VectorStorePort, RetrieverPort):
     def __init__(
         self,
         collection_name: str = None,
-        connection_string: str = None
+        connection_string: str = None,
+        ef_search: int = None
     ):
         self.collection_name = collection_name or settings.PGVECTOR_COLLECTION_NAME
         self.connection_string = connection_string or settings.get_postgres_uri()
+        self.ef_search = ef_search or settings.HNSW_EF_SEARCH
         self._embeddings = None
         self._vector_store: Optional[PGVectorStore] = None
+        self._collection_id: Optional[str] = None
+        self._query_batcher: Optional[_QueryEmbeddingBatcher] = None
+        # Pool psycopg des acces directs (COPY, filtres, suppressions), ouvert au premier usage
+        self._pool: Optional[AsyncConnectionPool] = None
         logger.debug("PGVectorAdapter initialise")
 
     def _get_embeddings(self):
@@ -79,18 +144,88 @@ class PGVectorAdapter(VectorStorePort, RetrieverPort):
     def _get_vector_store(self) -> PGVectorStore:
         """Retourne ou cree l'instance du vector store."""
         if self._vector_store is None:
-            self._vector_store = PGVectorStore(
-                embeddings=self._get_embeddings(),
-                collection_name=self.collection_name,
-                connection=self.connection_string,
-                use_jsonb=True
-            )
+            self._vector_store = self._create_vector_store()
         return self._vector_store
 
+    def _create_vector_store(self, pre_delete_collection: bool = False) -> PGVectorStore:
+        """
+        Cree le vector store (tables PGVector si absentes), puis applique le
+        schema des embeddings (type, index): pas de dependance a setup-db.
+        """
+        vector_store = PGVectorStore(
+            embeddings=self._get_embeddings(),
+            collection_name=self.collection_name,
+            connection=self._sqlalchemy_url(),
+            engine_args=self._engine_args(),
+            embedding_length=settings.EMBEDDING_DIMENSIONS or None,
+            use_jsonb=True,
+            pre_delete_collection=pre_delete_collection,
+        )
+        ensure_embedding_schema()
+        return vector_store
+
+    async def _get_pool(self) -> AsyncConnectionPool:
+        """
+        Pool de connexions des requetes psycopg directes (cree au premier usage).
+
+        Une connexion par batch COPY en vol (EMBED_CONCURRENCY) plus une pour
+        les lectures: pas de handshake PostgreSQL par operation.
+        """
+        if self._pool is None:
+            self._pool = AsyncConnectionPool(
+                conninfo=self.connection_string,
+                min_size=1,
+                max_size=settings.EMBED_CONCURRENCY + 1,
+                open=False,
+            )
+        await self._pool.open()  # sans effet si deja ouvert
+        return self._pool
+
+    async def aclose(self) -> None:
+        """Ferme le pool de connexions (arret du processus)."""
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+
+    def ensure_schema(self) -> None:
+        """Cree les tables PGVector et applique le schema des embeddings (demarrage)."""
+        self._get_vector_store()
+
+    def _sqlalchemy_url(self) -> str:
+        """URI SQLAlchemy de PGVector, forcee sur le driver psycopg3."""
+        scheme, sep, rest = self.connection_string.partition("://")
+        if scheme in ("postgresql", "postgres"):
+            return f"postgresql+psycopg{sep}{rest}"
+        return self.connection_string
+
+    def _engine_args(self) -> dict:
+        """
+        Options du moteur SQLAlchemy de PGVector.
+
+        - hnsw.ef_search est fixe a l'ouverture de chaque connexion du pool:
+          toutes les recherches l'utilisent sans SET supplementaire par requete.
+        - prepare_threshold=0: psycopg3 prepare la requete de similarite des sa
+          premiere execution sur une connexion, puis reutilise le plan (le texte
+          SQL est constant, l'embedding et k sont des parametres).
+        - pool borne a PGVECTOR_POOL_SIZE sans overflow: le nombre de connexions
+          reste dans le budget max_connections documente dans .env.example.
+        """
+        return {
+            "pool_size": settings.PGVECTOR_POOL_SIZE,
+            "max_overflow": 0,
+            "connect_args": {
+                "options": f"-c hnsw.ef_search={int(self.ef_search)}",
+                "prepare_threshold": 0,
+            }
+        }
+
     async def create_from_documents(self, documents: List[Document]) -> None:
         """
         Cree le vector store a partir d'une liste de documents.
         Supprime la collection existante et la recree.
+
+        Les documents sont ensuite indexes par batches de INDEX_BATCH_SIZE,
+        EMBED_CONCURRENCY batches en vol simultanement (embedding + COPY).
         """
         if not documents:
             logger.warning("Aucun document a indexer")
@@ -98,14 +233,23 @@ class PGVectorAdapter(VectorStorePort, RetrieverPort):
 
         logger.info(f"Indexation de {len(documents)} documents dans la collection '{self.collection_name}'")
 
-        self._vector_store = PGVectorStore.from_documents(
-            documents=documents,
-            embedding=self._get_embeddings(),
-            collection_name=self.collection_name,
-            connection=self.connection_string,
-            use_jsonb=True,
-            pre_delete_collection=True
+        # pre_delete_collection: la collection est supprimee puis recreee vide
+        self._vector_store = await asyncio.to_thread(
+            self._create_vector_store, pre_delete_collection=True
         )
+        self._collection_id = None
+        await self._get_collection_id()
+
+        semaphore = asyncio.Semaphore(settings.EMBED_CONCURRENCY)
+
+        async def add_batch(batch: List[Document]) -> None:
+            async with semaphore:
+                await self.add_documents(batch)
+
+        await asyncio.gather(*(
+            add_batch(documents[i:i + INDEX_BATCH_SIZE])
+            for i in range(0, len(documents), INDEX_BATCH_SIZE)
+        ))
 
         logger.info(f"Indexation terminee: {len(documents)} documents dans '{self.collection_name}'")
 
@@ -113,7 +257,9 @@ class PGVectorAdapter(VectorStorePort, RetrieverPort):
         """
         Ajoute des documents au vector store existant (pas de pre_delete).
 
-        Utilise aadd_documents pour ajouter sans supprimer la collection.
+        Les embeddings sont calcules en un appel, puis les lignes sont ecrites
+        dans langchain_pg_embedding via COPY (psycopg3): une seule commande
+        par batch au lieu d'INSERT ligne a ligne via SQLAlchemy.
         """
         if not documents:
             logger.warning("Aucun document a ajouter")
@@ -121,11 +267,70 @@ class PGVectorAdapter(VectorStorePort, RetrieverPort):
 
         logger.info(f"Ajout de {len(documents)} documents dans la collection '{self.collection_name}'")
 
-        vector_store = self._get_vector_store()
-        await asyncio.to_thread(vector_store.add_documents, documents)
+        from psycopg.types.json import Jsonb
+
+        texts = [doc.page_content for doc in documents]
+        embeddings = await self._get_embeddings().aembed_documents(texts)
+        collection_id = await self._get_collection_id()
+
+        pool = await self._get_pool()
+        async with pool.connection() as conn:
+            async with conn.cursor() as cur:
+                async with cur.copy(
+                    "COPY langchain_pg_embedding (id, collection_id, embedding, document, cmetadata) "
+                    "FROM STDIN"
+                ) as copy:
+                    for doc, embedding in zip(documents, embeddings):
+                        await copy.write_row((
+                            str(uuid.uuid4()),
+                            collection_id,
+                            # Format texte pgvector: "[x1,x2,...]"
+                            "[" + ",".join(map(str, embedding)) + "]",
+                            doc.page_content,
+                            Jsonb(doc.metadata),
+                        ))
+            await conn.commit()
 
         logger.info(f"Ajout termine: {len(documents)} documents dans '{self.collection_name}'")
 
+    async def _get_collection_id(self) -> str:
+        """Retourne l'UUID de la collection (creee au besoin par PGVector), mis en cache."""
+        if self._collection_id is None:
+            # L'initialisation de PGVector cree la collection si elle n'existe pas
+            await asyncio.to_thread(self._get_vector_store)
+            pool = await self._get_pool()
+            async with pool.connection() as conn:
+                cur = await conn.execute(
+                    "SELECT uuid FROM langchain_pg_collection WHERE name = %s",
+                    (self.collection_name,)
+                )
+                row = await cur.fetchone()
+            self._collection_id = str(row[0])
+        return self._collection_id
+
+    async def filter_existing_hashes(self, document_id: str, hashes: List[str]) -> set[str]:
+        """
+        Retourne les empreintes de contenu deja indexees pour un document.
+
+        Une seule requete pour tout le document (index idx_embedding_document_hash).
+        """
+        if not hashes:
+            return set()
+
+        pool = await self._get_pool()
+        async with pool.connection() as conn:
+            cur = await conn.execute(
+                """
+                SELECT DISTINCT cmetadata->>'content_hash'
+                FROM langchain_pg_embedding
+                WHERE cmetadata->>'document_id' = %s
+                  AND cmetadata->>'content_hash' = ANY(%s)
+                """,
+                (document_id, hashes)
+            )
+            rows = await cur.fetchall()
+        return {row[0] for row in rows}
+
     async def delete_by_document_id(self, document_id: str) -> int:
         """
         Supprime tous les vecteurs associés à un document.
@@ -136,12 +341,12 @@ class PGVectorAdapter(VectorStorePort, RetrieverPort):
         Returns:
             Nombre de vecteurs supprimés
         """
-        import psycopg
         from psycopg.rows import tuple_row
 
         logger.info(f"Suppression des vecteurs pour document_id={document_id}")
 
-        async with await psycopg.AsyncConnection.connect(self.connection_string) as conn:
+        pool = await self._get_pool()
+        async with pool.connection() as conn:
             async with conn.cursor(row_factory=tuple_row) as cur:
                 await cur.execute(
                     """
@@ -179,9 +384,9 @@ class PGVectorAdapter(VectorStorePort, RetrieverPort):
         if company_id:
             search_kwargs["filter"] = {"company_id": company_id}
 
-        logger.debug(f"Recherche: '{query[:50]}...' (k={k}, company_id={company_id})")
+        logger.debug("Recherche: '%.50s...' (k=%s, company_id=%s)", query, k, company_id)
         results = vector_store.similarity_search(query, **search_kwargs)
-        logger.debug(f"  -> {len(results)} resultats trouves")
+        logger.debug("  -> %d resultats trouves", len(results))
         return results
 
     def similarity_search_with_score(
@@ -270,6 +475,37 @@ class PGVectorAdapter(VectorStorePort, RetrieverPort):
         """
         return self.similarity_search_with_score(query, k=k, company_id=company_id)
 
+    async def aretrieve_formatted(
+        self,
+        query: str,
+        k: Optional[int] = None,
+        company_id: Optional[str] = None
+    ) -> str | None:
+        """
+        Version asynchrone de retrieve_formatted.
+
+        L'embedding de la requete passe par le _QueryEmbeddingBatcher (groupe
+        avec les requetes concurrentes), la recherche pgvector par vecteur
+        s'execute dans un thread.
+        """
+        k = k or settings.RETRIEVER_K
+        if self._query_batcher is None:
+            self._query_batcher = _QueryEmbeddingBatcher(self._get_embeddings())
+        embedding = await self._query_batcher.embed(query)
+
+        search_kwargs = {"k": k}
+        if company_id:
+            search_kwargs["filter"] = {"company_id": company_id}
+
+        vector_store = self._get_vector_store()
+        documents = await asyncio.to_thread(
+            vector_store.similarity_search_by_vector, embedding, **search_kwargs
+        )
+        if not documents:
+            return None
+        logger.info(f"  -> {len(documents)} documents trouves")
+        return self.format_documents(documents)
+
     def format_documents(self, documents: List[Any]) -> str:
         """
         Formate les documents en une chaine lisible pour le contexte.
@@ -4,10 +4,10 @@ Adapter Redis du canal de messaging.
 Utilise redis.asyncio pour une communication Pub/Sub asynchrone.
 """
 
-import json
 import logging
 from typing import AsyncIterator, Dict, Any, Optional
 
+import orjson
 import redis.asyncio as redis
 
 from src.domain.ports.message_channel_port import Message, MessageChannel
@@ -69,12 +69,12 @@ class RedisMessageChannel(MessageChannel):
 
         Args:
             channel: Nom du canal
-            message: Donnees a publier (sera serialise en JSON)
+            message: Donnees a publier (serialise en JSON via orjson, en bytes)
         """
         if self._redis is None:
             raise ConnectionError("Canal non connecte. Appelez connect() d'abord.")
 
-        payload = json.dumps(message)
+        payload = orjson.dumps(message)
         await self._redis.publish(channel, payload)
 
     async def subscribe(self, pattern: str) -> None:
@@ -105,7 +105,7 @@ class RedisMessageChannel(MessageChannel):
         async for raw_message in self._pubsub.listen():
             if raw_message["type"] == "pmessage":
                 try:
-                    data = json.loads(raw_message["data"])
+                    data = orjson.loads(raw_message["data"])
                     channel = raw_message["channel"]
                     if isinstance(channel, bytes):
                         channel = channel.decode("utf-8")
@@ -118,7 +118,7 @@ class RedisMessageChannel(MessageChannel):
                             "type": raw_message.get("type")
                         }
                     )
-                except json.JSONDecodeError as e:
+                except orjson.JSONDecodeError as e:
                     logger.warning(f"Message JSON invalide: {e}")
                 except Exception as e:
                     logger.error(f"Erreur lors du traitement du message: {e}")
@@ -121,14 +121,16 @@ class Container(containers.DeclarativeContainer):
     # TOOLS
     # =========================================================================
 
-    search_tool = providers.Factory(
+    search_tool = providers.Singleton(
         create_search_tool,
         rag_service=rag_service
     )
     """
-    Tool de recherche RAG (Factory).
+    Tool de recherche RAG (Singleton).
     Créé via create_search_tool() avec rag_service injecté.
     Le décorateur @tool est appliqué à l'intérieur de la factory.
+    Singleton: le tool est sans etat (company_id lu dans la config du run),
+    il est donc partage par toutes les instances de SimpleAgent du process.
 
     Graphe de dépendances:
         search_tool
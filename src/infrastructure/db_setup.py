@@ -22,6 +22,9 @@ def _create_companies_table() -> None:
 
     Cette table permet le multi-tenant: chaque entreprise a son propre
     prompt personnalise (nom, ton).
+
+    total_pages est un compteur materialise de SUM(documents.num_pages),
+    maintenu par PostgresDocumentRepository (lecture O(1) du quota).
     """
     create_table_sql = """
     CREATE TABLE IF NOT EXISTS companies (
@@ -30,8 +33,10 @@ def _create_companies_table() -> None:
         api_key VARCHAR(64) UNIQUE NOT NULL,
         tone VARCHAR(255) DEFAULT 'professionnel et courtois',
         plan VARCHAR(50) DEFAULT 'free',
+        total_pages INTEGER NOT NULL DEFAULT 0,
         created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
     );
+    ALTER TABLE companies ADD COLUMN IF NOT EXISTS total_pages INTEGER NOT NULL DEFAULT 0;
     CREATE INDEX IF NOT EXISTS idx_companies_api_key ON companies(api_key);
     """
 
@@ -58,10 +63,20 @@ def _create_documents_table() -> None:
         content_type VARCHAR(100) DEFAULT 'application/pdf',
         status VARCHAR(50) DEFAULT 'queued',
         error_message TEXT,
-        uploaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        chunk_count INTEGER,
+        uploaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        completed_at TIMESTAMP
     );
-    CREATE INDEX idx_documents_company_id ON documents(company_id);
+    -- Index couvrant pour list_by_company (filtre + tri sans etape de tri).
+    -- error_message (TEXT non borne) est exclu pour ne pas depasser la taille max d'une entree d'index.
+    CREATE INDEX idx_documents_company_uploaded ON documents (company_id, uploaded_at DESC)
+        INCLUDE (document_id, filename, gcs_path, size_bytes, num_pages, content_type, status);
     CREATE INDEX idx_documents_status ON documents(status);
+
+    -- Resynchronise le compteur de pages des entreprises
+    UPDATE companies c SET total_pages = COALESCE(
+        (SELECT SUM(d.num_pages) FROM documents d WHERE d.company_id = c.company_id), 0
+    );
     """
 
     with psycopg.connect(settings.get_postgres_uri()) as conn:
@@ -95,6 +110,114 @@ def _create_users_table() -> None:
         conn.commit()
 
 
+def _embedding_dimensions() -> int:
+    """Dimension des embeddings (EMBEDDING_DIMENSIONS, obligatoire)."""
+    dims = int(settings.EMBEDDING_DIMENSIONS)
+    if dims <= 0:
+        raise ValueError(
+            "EMBEDDING_DIMENSIONS doit etre defini: dimension du modele d'embedding "
+            "(ex: 768 pour nomic-embed-text, 1024 pour mistral-embed, "
+            "1536 pour text-embedding-3-small)"
+        )
+    return dims
+
+
+def _configure_embedding_storage(cur: psycopg.Cursor) -> None:
+    """
+    Convertit la colonne embedding au type settings.EMBEDDING_SQL_TYPE.
+
+    halfvec (FP16) divise par deux la taille des vecteurs sur disque et dans
+    l'index HNSW, pour une perte de rappel negligeable. Les vecteurs envoyes
+    par PGVector (insertion, recherche) sont convertis par le cast implicite
+    vector -> halfvec de pgvector.
+
+    Applique que la table contienne des lignes ou non (dimension lue dans
+    EMBEDDING_DIMENSIONS).
+    """
+    target_type = settings.EMBEDDING_SQL_TYPE
+    if target_type not in ("halfvec", "vector"):
+        raise ValueError(f"EMBEDDING_SQL_TYPE invalide: {target_type}")
+    dims = _embedding_dimensions()
+
+    cur.execute(f"""
+    DO $$
+    BEGIN
+        IF (
+            SELECT format_type(atttypid, atttypmod) FROM pg_attribute
+            WHERE attrelid = 'langchain_pg_embedding'::regclass AND attname = 'embedding'
+        ) <> '{target_type}({dims})' THEN
+            -- L'index HNSW depend de la classe d'operateurs du type: recree ensuite
+            DROP INDEX IF EXISTS idx_embedding_hnsw;
+            ALTER TABLE langchain_pg_embedding ALTER COLUMN embedding
+                TYPE {target_type}({dims}) USING embedding::{target_type}({dims});
+        END IF;
+    END $$;
+    """)
+
+
+def ensure_embedding_schema() -> None:
+    """
+    Applique le schema de la table des embeddings (idempotent).
+
+    Type de la colonne embedding, index HNSW (apres le type: la classe
+    d'operateurs en depend) et index des empreintes de contenu.
+
+    La table langchain_pg_embedding est creee par PGVector: PGVectorAdapter
+    appelle cette fonction juste apres la creation du vector store, setup-db
+    l'applique aussi si la table existe deja. Le schema ne depend donc ni
+    d'une execution de setup-db ni des lignes presentes.
+
+    Un verrou consultatif serialise les processus qui demarrent en meme temps.
+    """
+    _embedding_dimensions()  # configuration invalide: echec immediat
+
+    with psycopg.connect(settings.get_postgres_uri()) as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT pg_advisory_xact_lock(hashtext('langchain_pg_embedding'))")
+            cur.execute("SELECT to_regclass('langchain_pg_embedding') IS NOT NULL")
+            if not cur.fetchone()[0]:
+                return
+            _configure_embedding_storage(cur)
+            _create_embedding_hnsw_index(cur)
+            _create_embedding_hash_index(cur)
+        conn.commit()
+
+
+def _create_embedding_hnsw_index(cur: psycopg.Cursor) -> None:
+    """
+    Cree l'index HNSW (distance cosinus) des embeddings.
+
+    m / ef_construction (HNSW_M, HNSW_EF_CONSTRUCTION) au-dessus des defauts
+    pgvector (16 / 64): meilleur rappel et plus de QPS sur des corpus de
+    100K+ chunks, au prix d'une construction plus longue. La construction
+    dispose de plus de memoire et de workers paralleles (transaction uniquement).
+
+    Necessite une colonne de dimension fixe (voir _configure_embedding_storage).
+    Un index existant n'est pas reconstruit: DROP INDEX idx_embedding_hnsw
+    pour appliquer de nouveaux parametres.
+    """
+    opclass = f"{settings.EMBEDDING_SQL_TYPE}_cosine_ops"
+    cur.execute(
+        "SELECT set_config('maintenance_work_mem', %s, true), "
+        "set_config('max_parallel_maintenance_workers', %s, true)",
+        (settings.HNSW_MAINTENANCE_WORK_MEM, str(settings.HNSW_BUILD_PARALLEL_WORKERS)),
+    )
+    cur.execute(f"""
+    CREATE INDEX IF NOT EXISTS idx_embedding_hnsw ON langchain_pg_embedding
+        USING hnsw (embedding {opclass})
+        WITH (m = {int(settings.HNSW_M)}, ef_construction = {int(settings.HNSW_EF_CONSTRUCTION)})
+    """)
+
+
+def _create_embedding_hash_index(cur: psycopg.Cursor) -> None:
+    """Indexe les empreintes de contenu des chunks (deduplication a la reindexation)."""
+    cur.execute("""
+    CREATE INDEX IF NOT EXISTS idx_embedding_document_hash ON langchain_pg_embedding
+        ((cmetadata->>'document_id'), (cmetadata->>'content_hash'))
+        WHERE cmetadata ? 'content_hash'
+    """)
+
+
 def test_connection() -> bool:
     """
     Teste la connexion a PostgreSQL.
@@ -146,6 +269,11 @@ def setup_postgres() -> bool:
             _create_users_table()
             print("Table users creee avec succes!")
 
+            # Stockage des embeddings (halfvec), index HNSW et index de deduplication
+            # des chunks (si la table des embeddings existe; sinon applique par
+            # PGVectorAdapter a sa creation)
+            ensure_embedding_schema()
+
             print("\nTables PostgreSQL creees:")
             print("  - checkpoints: Etats complets du graphe a chaque etape")
             print("  - checkpoint_writes: Ecritures intermediaires (pending writes)")
@@ -3,9 +3,12 @@ Repository pour l'acces aux donnees entreprise dans PostgreSQL.
 """
 
 import logging
-from typing import Optional
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
 
 import psycopg
+from psycopg.rows import tuple_row
+from psycopg_pool import AsyncConnectionPool
 
 from src.config import settings
 from src.domain.models.company import Company, CompanyPlan
@@ -18,8 +21,26 @@ class CompanyRepository:
     Acces aux donnees entreprise dans PostgreSQL.
 
     Utilise psycopg3 pour les operations synchrones et asynchrones.
+
+    Args:
+        pool: Pool de connexions partage (ex: celui du checkpointer de l'agent).
+            Sans pool, chaque operation ouvre sa propre connexion (usage CLI).
     """
 
+    def __init__(self, pool: Optional[AsyncConnectionPool] = None):
+        self._pool = pool
+
+    @asynccontextmanager
+    async def _connection(self) -> AsyncIterator[psycopg.AsyncConnection]:
+        if self._pool is not None:
+            async with self._pool.connection() as conn:
+                yield conn
+        else:
+            async with await psycopg.AsyncConnection.connect(
+                settings.get_postgres_uri()
+            ) as conn:
+                yield conn
+
     async def get_by_id(self, company_id: str) -> Optional[Company]:
         """
         Recupere une entreprise par son ID.
@@ -30,10 +51,8 @@ class CompanyRepository:
         Returns:
             Company si trouvee, None sinon
         """
-        async with await psycopg.AsyncConnection.connect(
-            settings.get_postgres_uri()
-        ) as conn:
-            async with conn.cursor() as cur:
+        async with self._connection() as conn:
+            async with conn.cursor(row_factory=tuple_row) as cur:
                 await cur.execute(
                     "SELECT company_id, name, tone, plan FROM companies WHERE company_id = %s",
                     (company_id,)
@@ -56,10 +75,8 @@ class CompanyRepository:
         Args:
             company: Instance Company a sauvegarder
         """
-        async with await psycopg.AsyncConnection.connect(
-            settings.get_postgres_uri()
-        ) as conn:
-            async with conn.cursor() as cur:
+        async with self._connection() as conn:
+            async with conn.cursor(row_factory=tuple_row) as cur:
                 await cur.execute(
                     """
                     INSERT INTO companies (company_id, name, tone, plan)
@@ -82,10 +99,8 @@ class CompanyRepository:
         Returns:
             Liste de Company
         """
-        async with await psycopg.AsyncConnection.connect(
-            settings.get_postgres_uri()
-        ) as conn:
-            async with conn.cursor() as cur:
+        async with self._connection() as conn:
+            async with conn.cursor(row_factory=tuple_row) as cur:
                 await cur.execute(
                     "SELECT company_id, name, tone, plan FROM companies ORDER BY name"
                 )
@@ -111,10 +126,8 @@ class CompanyRepository:
         Returns:
             True si supprimee, False si non trouvee
         """
-        async with await psycopg.AsyncConnection.connect(
-            settings.get_postgres_uri()
-        ) as conn:
-            async with conn.cursor() as cur:
+        async with self._connection() as conn:
+            async with conn.cursor(row_factory=tuple_row) as cur:
                 await cur.execute(
                     "DELETE FROM companies WHERE company_id = %s",
                     (company_id,)
@@ -0,0 +1,141 @@
+"""Tests de PostgresDocumentRepository.record_page_count (reservation de pages)."""
+
+import asyncio
+
+import pytest
+
+from backend.domain.exceptions import DocumentNotFoundError
+from backend.infrastructure.repositories.document_repository import PostgresDocumentRepository
+
+
+class _FakeDatabase:
+    """Etat minimal des tables documents/companies, avec transactions."""
+
+    def __init__(self, documents: dict, total_pages: int):
+        self.documents = dict(documents)
+        self.total_pages = total_pages
+
+
+class _FakeCursor:
+    def __init__(self, conn: "_FakeConnection"):
+        self._conn = conn
+        self._row = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, query: str, params: tuple) -> None:
+        pending = self._conn.pending
+        sql = " ".join(query.split())
+        if sql.startswith("SELECT num_pages FROM documents"):
+            (document_id,) = params
+            if document_id in pending["documents"]:
+                self._row = (pending["documents"][document_id],)
+            else:
+                self._row = None
+        elif sql.startswith("UPDATE companies"):
+            delta, company_id, _, _, max_pages = params
+            total = pending["total_pages"]
+            if delta < 0 or total + delta <= max_pages:
+                pending["total_pages"] = max(total + delta, 0)
+                self._row = (company_id,)
+            else:
+                self._row = None
+        elif sql.startswith("UPDATE documents SET num_pages"):
+            num_pages, document_id = params
+            pending["documents"][document_id] = num_pages
+            self._row = None
+        else:
+            raise AssertionError(f"Requete inattendue: {sql}")
+
+    async def fetchone(self):
+        return self._row
+
+
+class _FakeConnection:
+    def __init__(self, db: _FakeDatabase):
+        self._db = db
+        self.pending = {"documents": dict(db.documents), "total_pages": db.total_pages}
+
+    def cursor(self) -> _FakeCursor:
+        return _FakeCursor(self)
+
+    async def commit(self) -> None:
+        self._db.documents = dict(self.pending["documents"])
+        self._db.total_pages = self.pending["total_pages"]
+
+    async def rollback(self) -> None:
+        self.pending = {"documents": dict(self._db.documents), "total_pages": self._db.total_pages}
+
+
+class _FakePool:
+    def __init__(self, db: _FakeDatabase):
+        self._db = db
+
+    def connection(self):
+        pool = self
+
+        class _Ctx:
+            async def __aenter__(self):
+                return _FakeConnection(pool._db)
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return _Ctx()
+
+
+def _record(db: _FakeDatabase, num_pages: int, max_pages: int = 100) -> bool:
+    repo = PostgresDocumentRepository(_FakePool(db))
+    return asyncio.run(repo.record_page_count("doc-1", "acme", num_pages, max_pages))
+
+
+def test_first_reservation_charges_pages():
+    db = _FakeDatabase({"doc-1": 0}, total_pages=10)
+    assert _record(db, 12) is True
+    assert db.total_pages == 22
+    assert db.documents["doc-1"] == 12
+
+
+def test_repeated_reservation_is_idempotent():
+    # Job rejoue par ARQ: les pages deja enregistrees ne sont pas refacturees
+    db = _FakeDatabase({"doc-1": 0}, total_pages=10)
+    assert _record(db, 12) is True
+    assert _record(db, 12) is True
+    assert db.total_pages == 22
+
+
+def test_reservation_charges_only_the_difference():
+    db = _FakeDatabase({"doc-1": 12}, total_pages=22)
+    assert _record(db, 15) is True
+    assert db.total_pages == 25
+
+
+def test_lower_page_count_releases_pages():
+    db = _FakeDatabase({"doc-1": 12}, total_pages=22)
+    assert _record(db, 5) is True
+    assert db.total_pages == 15
+    assert db.documents["doc-1"] == 5
+
+
+def test_reservation_over_quota_is_refused_without_side_effect():
+    db = _FakeDatabase({"doc-1": 0}, total_pages=95)
+    assert _record(db, 6, max_pages=100) is False
+    assert db.total_pages == 95
+    assert db.documents["doc-1"] == 0
+
+
+def test_reservation_up_to_quota_is_accepted():
+    db = _FakeDatabase({"doc-1": 0}, total_pages=95)
+    assert _record(db, 5, max_pages=100) is True
+    assert db.total_pages == 100
+
+
+def test_missing_document_raises():
+    db = _FakeDatabase({}, total_pages=10)
+    with pytest.raises(DocumentNotFoundError):
+        _record(db, 12)
+    assert db.total_pages == 10
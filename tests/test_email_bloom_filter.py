@@ -0,0 +1,48 @@
+"""Tests du filtre de Bloom des emails utilisateurs."""
+
+from backend.infrastructure.adapters.email_bloom_filter import UserEmailBloom
+
+
+def test_not_ready_until_hydrated():
+    bloom = UserEmailBloom(capacity=100)
+    assert bloom.ready is False
+    bloom.mark_ready()
+    assert bloom.ready is True
+
+
+def test_empty_filter_contains_nothing():
+    bloom = UserEmailBloom(capacity=100)
+    assert not bloom.might_contain("alice@example.com")
+
+
+def test_no_false_negative():
+    bloom = UserEmailBloom(capacity=1000)
+    emails = [f"user{i}@example.com" for i in range(1000)]
+    for email in emails:
+        bloom.add(email)
+    assert all(bloom.might_contain(email) for email in emails)
+
+
+def test_no_false_negative_beyond_capacity():
+    bloom = UserEmailBloom(capacity=10)
+    emails = [f"user{i}@example.com" for i in range(200)]
+    for email in emails:
+        bloom.add(email)
+    assert all(bloom.might_contain(email) for email in emails)
+
+
+def test_false_positive_rate_within_bound():
+    bloom = UserEmailBloom(capacity=1000, error_rate=0.01)
+    for i in range(1000):
+        bloom.add(f"user{i}@example.com")
+    false_positives = sum(
+        bloom.might_contain(f"absent{i}@example.com") for i in range(10000)
+    )
+    # Marge x3 sur le taux cible: le test reste deterministe (blake2b)
+    assert false_positives / 10000 < 0.03
+
+
+def test_tiny_capacity_is_usable():
+    bloom = UserEmailBloom(capacity=1)
+    bloom.add("alice@example.com")
+    assert bloom.might_contain("alice@example.com")
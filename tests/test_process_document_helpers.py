@@ -0,0 +1,139 @@
+"""Tests des fonctions de decoupage et de batching du worker de vectorisation."""
+
+from langchain_core.documents import Document as LangchainDocument
+
+from backend.worker.use_cases.process_document import (
+    CHARS_PER_TOKEN,
+    MIN_PAGES_PER_TASK,
+    _finalize_chunks,
+    _merge_small_chunks,
+    _page_ranges,
+    _token_batches,
+)
+
+
+def _chunk(text: str, page: int = 0, start_index=None) -> LangchainDocument:
+    metadata = {"page": page}
+    if start_index is not None:
+        metadata["start_index"] = start_index
+    return LangchainDocument(page_content=text, metadata=metadata)
+
+
+# === _merge_small_chunks ===
+
+def test_merge_empty_input():
+    assert _merge_small_chunks([], min_size=10, max_size=100) == []
+
+
+def test_merge_keeps_large_chunks():
+    chunks = [_chunk("a" * 50, page=0), _chunk("b" * 50, page=1)]
+    merged = _merge_small_chunks(chunks, min_size=20, max_size=200)
+    assert [c.page_content for c in merged] == ["a" * 50, "b" * 50]
+
+
+def test_merge_last_small_chunk_into_predecessor():
+    chunks = [_chunk("a" * 50, page=0), _chunk("b" * 50, page=1), _chunk("tail", page=2)]
+    merged = _merge_small_chunks(chunks, min_size=20, max_size=200)
+    assert len(merged) == 2
+    assert merged[-1].page_content == "b" * 50 + "\ntail"
+    # Les metadonnees du premier morceau sont conservees
+    assert merged[-1].metadata["page"] == 1
+
+
+def test_merge_does_not_exceed_max_size():
+    chunks = [_chunk("a" * 50, page=0), _chunk("tail", page=1)]
+    merged = _merge_small_chunks(chunks, min_size=20, max_size=54)
+    assert [c.page_content for c in merged] == ["a" * 50, "tail"]
+
+
+def test_merge_removes_overlap_on_same_page():
+    # "bbbb" (positions 5-8) est partage par les deux chunks du splitter
+    chunks = [
+        _chunk("aaaa bbbb", page=3, start_index=0),
+        _chunk("bbbb cccc", page=3, start_index=5),
+        _chunk("cccc dddd", page=3, start_index=10),
+    ]
+    merged = _merge_small_chunks(chunks, min_size=100, max_size=1000)
+    assert len(merged) == 1
+    assert merged[0].page_content == "aaaa bbbb cccc dddd"
+
+
+def test_merge_keeps_text_across_pages():
+    # Meme start_index sur une autre page: aucun recouvrement a retirer
+    chunks = [_chunk("aaaa bbbb", page=0, start_index=0), _chunk("bbbb", page=1, start_index=0)]
+    merged = _merge_small_chunks(chunks, min_size=100, max_size=1000)
+    assert merged[0].page_content == "aaaa bbbb\nbbbb"
+
+
+def test_merge_without_start_index_joins_with_newline():
+    chunks = [_chunk("aaaa", page=0), _chunk("bbbb", page=0)]
+    merged = _merge_small_chunks(chunks, min_size=100, max_size=1000)
+    assert merged[0].page_content == "aaaa\nbbbb"
+
+
+# === _finalize_chunks ===
+
+def test_finalize_drops_start_index_and_sets_hash():
+    chunks = _finalize_chunks([_chunk("x" * 2000, page=0, start_index=0)])
+    assert "start_index" not in chunks[0].metadata
+    assert len(chunks[0].metadata["content_hash"]) == 64
+
+
+def test_finalize_hash_is_stable_for_same_content():
+    first = _finalize_chunks([_chunk("y" * 2000, page=0)])
+    second = _finalize_chunks([_chunk("y" * 2000, page=5)])
+    assert first[0].metadata["content_hash"] == second[0].metadata["content_hash"]
+
+
+# === _token_batches ===
+
+def _sized(tokens: int) -> LangchainDocument:
+    return _chunk("t" * (tokens * CHARS_PER_TOKEN))
+
+
+def test_token_batches_empty_input():
+    assert list(_token_batches([], max_tokens=100)) == []
+
+
+def test_token_batches_fills_budget_exactly():
+    chunks = [_sized(40), _sized(60)]
+    batches = list(_token_batches(chunks, max_tokens=100))
+    assert [len(b) for b in batches] == [2]
+
+
+def test_token_batches_splits_at_boundary():
+    chunks = [_sized(40), _sized(60), _sized(1)]
+    batches = list(_token_batches(chunks, max_tokens=100))
+    assert [len(b) for b in batches] == [2, 1]
+    assert batches[1][0] is chunks[2]
+
+
+def test_token_batches_oversized_chunk_gets_own_batch():
+    chunks = [_sized(10), _sized(500), _sized(10)]
+    batches = list(_token_batches(chunks, max_tokens=100))
+    assert [len(b) for b in batches] == [1, 1, 1]
+
+
+# === _page_ranges ===
+
+def test_page_ranges_empty_document():
+    assert _page_ranges(0, parts=4) == []
+
+
+def test_page_ranges_small_document_single_range():
+    assert _page_ranges(MIN_PAGES_PER_TASK - 1, parts=4) == [(0, MIN_PAGES_PER_TASK - 1)]
+
+
+def test_page_ranges_cover_all_pages_contiguously():
+    for num_pages in (8, 33, 100, 257):
+        ranges = _page_ranges(num_pages, parts=4)
+        assert ranges[0][0] == 0
+        assert ranges[-1][1] == num_pages
+        assert all(prev[1] == nxt[0] for prev, nxt in zip(ranges, ranges[1:]))
+        assert len(ranges) <= 4
+
+
+def test_page_ranges_respect_min_pages_per_task():
+    ranges = _page_ranges(3 * MIN_PAGES_PER_TASK, parts=16)
+    assert len(ranges) == 3
+    assert all(stop - start >= MIN_PAGES_PER_TASK for start, stop in ranges)